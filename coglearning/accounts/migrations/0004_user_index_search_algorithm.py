@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_algorithm_preferences'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='preferred_search_algorithm',
+            field=models.CharField(blank=True, choices=[('linear', 'Linear Search'), ('binary', 'Binary Search'), ('index', 'Inverted Index')], default='linear', max_length=20),
+        ),
+    ]
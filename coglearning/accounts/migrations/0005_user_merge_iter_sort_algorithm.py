@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_index_search_algorithm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='preferred_sort_algorithm',
+            field=models.CharField(blank=True, choices=[('bubble', 'Bubble Sort'), ('merge', 'Merge Sort'), ('merge_iter', 'Merge Sort (iterative)')], default='bubble', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_merge_iter_sort_algorithm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='recommendation_clicks_backfilled',
+            field=models.BooleanField(default=False),
+        ),
+    ]
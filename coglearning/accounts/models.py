@@ -11,10 +11,12 @@ class User(AbstractUser):
     SORT_ALGO_CHOICES = (
         ("bubble", "Bubble Sort"),
         ("merge", "Merge Sort"),
+        ("merge_iter", "Merge Sort (iterative)"),
     )
     SEARCH_ALGO_CHOICES = (
         ("linear", "Linear Search"),
         ("binary", "Binary Search"),
+        ("index", "Inverted Index"),
     )
     SORT_FIELD_CHOICES = (
         ("title", "عنوان"),
@@ -27,6 +29,8 @@ class User(AbstractUser):
     # سطح شناختی شهروند بین ۱ تا ۱۰۰
     cognitive_level = models.IntegerField(default=1, null=True, blank=True)
     has_taken_placement_test = models.BooleanField(default=False)
+    # کلیک‌های قدیمی «خوانده شد» یک بار به پیشرفت محتوا منتقل شده‌اند
+    recommendation_clicks_backfilled = models.BooleanField(default=False)
 
     # ترجیحات الگوریتم کاتالوگ آزمون (silver_project → API)
     preferred_sort_algorithm = models.CharField(
@@ -0,0 +1,33 @@
+"""ایندکس درون‌پردازه‌ای بازه سطح (min_level/max_level) محتواهای فعال، با نسخه مشترک در دیتابیس."""
+
+import threading
+
+from algorithms.levels import LevelIndex
+from assessment.revisions import bump_revision, current_revision
+
+LEARNING_CONTENT = "learning_content"
+
+_level_index = None
+_level_index_lock = threading.Lock()
+
+
+def get_level_index():
+    """LevelIndex همه محتواهای فعال برای نسخه فعلی؛ با تغییر نسخه (در هر پردازه‌ای) دوباره ساخته می‌شود."""
+    global _level_index
+    revision = current_revision(LEARNING_CONTENT)
+    index = _level_index
+    if index is None or index.version != revision:
+        with _level_index_lock:
+            index = _level_index
+            if index is None or index.version != revision:
+                from .models import LearningContent
+
+                rows = LearningContent.objects.filter(is_active=True).values("id", "min_level", "max_level")
+                index = LevelIndex(rows, version=revision)
+                _level_index = index
+    return index
+
+
+def invalidate_level_index():
+    """نسخه جدید در تراکنش نوشتن؛ بعد از commit همه پردازه‌ها ایندکس را بازسازی می‌کنند."""
+    bump_revision(LEARNING_CONTENT)
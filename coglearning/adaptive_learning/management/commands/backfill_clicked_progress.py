@@ -0,0 +1,34 @@
+"""
+One-time backfill of legacy «خوانده شد» clicks into UserContentProgress.
+
+Usage (from coglearning/):
+    python manage.py backfill_clicked_progress [--chunk-size 500]
+
+Users already marked recommendation_clicks_backfilled are skipped, so the
+command is safe to re-run; GET endpoints backfill lazily for anyone left.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from adaptive_learning.services import AdaptiveLearningEngine
+
+
+class Command(BaseCommand):
+    help = 'Promote clicked recommendations into content progress and mark users as backfilled'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        pending = User.objects.filter(recommendation_clicks_backfilled=False).only(
+            'id', 'recommendation_clicks_backfilled',
+        )
+        done = 0
+        for user in pending.iterator(chunk_size=options['chunk_size']):
+            with transaction.atomic():
+                AdaptiveLearningEngine.backfill_clicked_progress(user)
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f'Backfilled clicked progress for {done} users'))
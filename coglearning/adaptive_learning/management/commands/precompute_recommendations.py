@@ -0,0 +1,50 @@
+"""
+Precompute content recommendations for every active student.
+
+Usage (from coglearning/), e.g. nightly from cron:
+    python manage.py precompute_recommendations [--chunk-size 500]
+
+Students are processed in chunks; each chunk costs a fixed number of
+queries (set-based cleanup, two reads, one bulk_create). The
+/recommended/ endpoint then only reads the stored rows.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from adaptive_learning.services import AdaptiveLearningEngine
+
+
+class Command(BaseCommand):
+    help = 'Precompute content recommendations for all active students in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        User = get_user_model()
+        students = (
+            User.objects.filter(role='student', is_active=True, has_taken_placement_test=True)
+            .only('id', 'cognitive_level')
+            .order_by('pk')
+        )
+        users = 0
+        created = 0
+        chunk = []
+        for user in students.iterator(chunk_size=chunk_size):
+            chunk.append(user)
+            if len(chunk) >= chunk_size:
+                created += self._run(chunk)
+                users += len(chunk)
+                chunk = []
+        if chunk:
+            created += self._run(chunk)
+            users += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f'Precomputed {created} recommendations for {users} students'))
+
+    @staticmethod
+    def _run(chunk):
+        with transaction.atomic():
+            return AdaptiveLearningEngine.precompute_recommendations(chunk)
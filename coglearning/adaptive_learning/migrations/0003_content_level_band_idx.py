@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adaptive_learning', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='learningcontent',
+            index=models.Index(fields=['is_active', 'min_level', 'max_level'], name='content_level_band_idx'),
+        ),
+    ]
@@ -18,6 +18,12 @@ class LearningContent(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # پوشش کوئری باند سطح (is_active + min/max) بدون خواندن جدول
+        indexes = [
+            models.Index(fields=["is_active", "min_level", "max_level"], name="content_level_band_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} (Lvl: {self.min_level}-{self.max_level})"
 
@@ -1,5 +1,58 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .level_index import get_level_index
 from .models import LearningContent, LearningPath, LearningPathItem, ContentRecommendation, UserContentProgress
 
+# پهنای باند سطح در پیشنهاد محتوا (سطح کاربر ± این مقدار)
+RECOMMENDATION_LEVEL_BAND = 5
+RECOMMENDATION_COUNT = 10
+
+
+def sample_ids(population, k, exclude=(), rng=random):
+    """
+    k عضو تصادفی و بدون تکرار از population (به‌جز اعضای exclude).
+
+    Fisher–Yates تنبل: فقط خانه‌های جابه‌جاشده در dict نگه داشته می‌شوند،
+    پس هزینه O(k + تعداد ردشده‌ها) است و لیست کپی یا مرتب نمی‌شود.
+    """
+    n = len(population)
+    swaps = {}
+    picked = []
+    for i in range(n):
+        if len(picked) >= k:
+            break
+        j = rng.randrange(i, n)
+        value = population[swaps.get(j, j)]
+        swaps[j] = swaps.get(i, i)
+        if value not in exclude:
+            picked.append(value)
+    return picked
+
+
+def pick_recommendations(index, level, existing_ids, completed_ids, rng=random):
+    """شناسه محتواهای تازه برای تکمیل RECOMMENDATION_COUNT پیشنهاد در باند سطح کاربر."""
+    need = max(0, RECOMMENDATION_COUNT - len(existing_ids))
+    if need == 0:
+        return []
+    band_ids = index.overlapping(level - RECOMMENDATION_LEVEL_BAND, level + RECOMMENDATION_LEVEL_BAND)
+    return sample_ids(band_ids, need, exclude=set(existing_ids) | set(completed_ids), rng=rng)
+
+
+def _completed_content():
+    """شرط Exists: محتوای پیشنهاد را همان کاربر کامل کرده است."""
+    return Exists(
+        UserContentProgress.objects.filter(
+            user_id=OuterRef("user_id"), content_id=OuterRef("content_id"), is_completed=True,
+        )
+    )
+
+
 class AdaptiveLearningEngine:
     @staticmethod
     def record_content_completed(user, content):
@@ -15,6 +68,34 @@ class AdaptiveLearningEngine:
             progress.save(update_fields=["progress_percent", "is_completed", "last_accessed"])
         return progress
 
+    @staticmethod
+    def backfill_clicked_progress(user):
+        """
+        انتقال یک‌باره کلیک‌های قدیمی «خوانده شد» (فقط is_clicked) به پیشرفت محتوا.
+
+        کلیک‌های جدید در mark_recommendation_clicked ثبت می‌شوند، پس بعد از
+        علامت‌گذاری کاربر این متد بدون هیچ کوئری برمی‌گردد.
+        """
+        if user.recommendation_clicks_backfilled:
+            return
+        clicked = set(
+            ContentRecommendation.objects.filter(user=user, is_clicked=True).values_list("content_id", flat=True)
+        )
+        if clicked:
+            progress = UserContentProgress.objects.filter(user=user, content_id__in=clicked)
+            progress.filter(Q(is_completed=False) | Q(progress_percent__lt=100)).update(
+                progress_percent=100, is_completed=True, last_accessed=timezone.now(),
+            )
+            missing = clicked - set(progress.values_list("content_id", flat=True))
+            UserContentProgress.objects.bulk_create(
+                [
+                    UserContentProgress(user=user, content_id=content_id, progress_percent=100, is_completed=True)
+                    for content_id in sorted(missing)
+                ]
+            )
+        type(user).objects.filter(pk=user.pk).update(recommendation_clicks_backfilled=True)
+        user.recommendation_clicks_backfilled = True
+
     @staticmethod
     def generate_recommendations(user):
         """الگوریتم پیشنهاد محتوا بر اساس سطح ۱-۱۰۰ کاربر.
@@ -23,9 +104,8 @@ class AdaptiveLearningEngine:
         """
         level = user.cognitive_level or 1
 
-        # «خوانده شد» must show up under پیشرفت — backfill progress for older clicks.
-        for rec in ContentRecommendation.objects.filter(user=user, is_clicked=True).select_related("content"):
-            AdaptiveLearningEngine.record_content_completed(user, rec.content)
+        # «خوانده شد» must show up under پیشرفت — older clicks are backfilled once per user.
+        AdaptiveLearningEngine.backfill_clicked_progress(user)
 
         # Drop recs for completed or inactive content; keep the rest (and their IDs).
         ContentRecommendation.objects.filter(
@@ -38,78 +118,129 @@ class AdaptiveLearningEngine:
         existing_ids = set(
             ContentRecommendation.objects.filter(user=user).values_list("content_id", flat=True)
         )
-        need = max(0, 10 - len(existing_ids))
-        if need == 0:
+        if len(existing_ids) >= RECOMMENDATION_COUNT:
             return
 
-        contents = (
-            LearningContent.objects.filter(
-                is_active=True,
-                min_level__lte=level + 5,
-                max_level__gte=level - 5,
-            )
-            .exclude(usercontentprogress__user=user, usercontentprogress__is_completed=True)
-            .exclude(id__in=existing_ids)
-            .order_by("?")[:need]
+        # به‌جای ORDER BY ? (مرتب‌سازی کل جدول در هر درخواست) شناسه‌های باند سطح
+        # از ایندکس بازه‌ای خوانده می‌شوند و چند عضو تصادفی از آن‌ها انتخاب می‌شود.
+        completed_ids = set(
+            UserContentProgress.objects.filter(user=user, is_completed=True).values_list("content_id", flat=True)
         )
+        picked = pick_recommendations(get_level_index(), level, existing_ids, completed_ids)
+        # ایندکس پردازه‌های دیگر ممکن است لحظه‌ای عقب باشد؛ فقط محتوای فعال موجود ثبت می‌شود
+        picked = set(LearningContent.objects.filter(id__in=picked, is_active=True).values_list("id", flat=True))
 
         ContentRecommendation.objects.bulk_create(
             [
                 ContentRecommendation(
                     user=user,
-                    content=c,
+                    content_id=content_id,
                     recommendation_type=f"پیشنهاد شده برای سطح {level}",
                     priority_weight=1.0,
                 )
-                for c in contents
+                for content_id in sorted(picked)
             ]
         )
 
     @staticmethod
+    def visible_recommendations(user):
+        """پیشنهادهای ذخیره‌شده کاربر بدون محتوای غیرفعال یا تکمیل‌شده (فقط خواندن)."""
+        return (
+            ContentRecommendation.objects.filter(user=user, content__is_active=True)
+            .exclude(_completed_content())
+            .select_related("content")
+        )
+
+    @staticmethod
+    def precompute_recommendations(users):
+        """
+        پیشنهادهای یک دسته کاربر با تعداد ثابتی کوئری (مستقل از اندازه دسته):
+        حذف مجموعه‌ای پیشنهادهای منقضی، دو خواندن values_list و یک bulk_create.
+        ردیف‌های موجود (و is_clicked آن‌ها) حفظ و فقط تا RECOMMENDATION_COUNT تکمیل می‌شوند.
+        """
+        levels = {user.pk: user.cognitive_level or 1 for user in users}
+        if not levels:
+            return 0
+        user_ids = list(levels)
+
+        ContentRecommendation.objects.filter(user_id__in=user_ids).filter(
+            Q(content__is_active=False) | Q(_completed_content())
+        ).delete()
+
+        completed = defaultdict(set)
+        for user_id, content_id in UserContentProgress.objects.filter(
+            user_id__in=user_ids, is_completed=True
+        ).values_list("user_id", "content_id"):
+            completed[user_id].add(content_id)
+        existing = defaultdict(set)
+        for user_id, content_id in ContentRecommendation.objects.filter(
+            user_id__in=user_ids
+        ).values_list("user_id", "content_id"):
+            existing[user_id].add(content_id)
+
+        index = get_level_index()
+        rows = [
+            ContentRecommendation(
+                user_id=user_id,
+                content_id=content_id,
+                recommendation_type=f"پیشنهاد شده برای سطح {level}",
+                priority_weight=1.0,
+            )
+            for user_id, level in levels.items()
+            for content_id in pick_recommendations(index, level, existing[user_id], completed[user_id])
+        ]
+        ContentRecommendation.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    @staticmethod
+    @transaction.atomic
     def create_or_refresh_path(user):
-        """ساخت یا بازنشانی مسیر یادگیری فعال"""
+        """
+        ساخت یا بازنشانی مسیر یادگیری فعال.
+
+        رتبه‌بندی سه مرحله‌ای روی ایندکس سطح در حافظه انجام می‌شود، پس هزینه
+        مستقل از طول مسیر است: غیرفعال‌سازی، ساخت مسیر، محتواهای تکمیل‌شده،
+        خواندن محتواهای انتخاب‌شده و یک bulk_create برای آیتم‌ها.
+        """
+        length = max(1, getattr(settings, "LEARNING_PATH_LENGTH", 5))
         LearningPath.objects.filter(user=user, is_active=True).update(is_active=False)
         level = user.cognitive_level or 1
         path = LearningPath.objects.create(user=user, name=f"مسیر یادگیری سطح {level}")
 
-        base_qs = LearningContent.objects.filter(is_active=True).exclude(
-            usercontentprogress__user=user,
-            usercontentprogress__is_completed=True,
+        index = get_level_index()
+        completed_ids = set(
+            UserContentProgress.objects.filter(user=user, is_completed=True).values_list("content_id", flat=True)
         )
+        chosen = []
+        seen = set()
 
-        # ۱) محتوایی که سطح کاربر داخل بازه min/max آن است
-        contents = list(
-            base_qs.filter(min_level__lte=level, max_level__gte=level)
-            .order_by("min_level", "id")[:5]
-        )
+        def take(candidate_ids):
+            for content_id in candidate_ids:
+                if len(chosen) >= length:
+                    return
+                if content_id not in completed_ids and content_id not in seen:
+                    seen.add(content_id)
+                    chosen.append(content_id)
 
+        # ۱) محتوایی که سطح کاربر داخل بازه min/max آن است
+        take(index.containing(level, ordered=True))
         # ۲) محتواهای قابل انجام (min_level <= سطح) حتی اگر max_level پایین‌تر باشد
-        if len(contents) < 5:
-            need = 5 - len(contents)
-            have = {c.id for c in contents}
-            more = list(
-                base_qs.filter(min_level__lte=level)
-                .exclude(id__in=have)
-                .order_by("-min_level", "id")[:need]
-            )
-            contents.extend(more)
-
+        take(index.starting_between(hi=level, descending=True))
         # ۳) محتواهای سطح بالاتر (قفل) برای ادامه مسیر
-        if len(contents) < 5:
-            need = 5 - len(contents)
-            have = {c.id for c in contents}
-            future = list(
-                base_qs.filter(min_level__gt=level)
-                .exclude(id__in=have)
-                .order_by("min_level", "id")[:need]
-            )
-            contents.extend(future)
-
-        for i, c in enumerate(contents):
-            LearningPathItem.objects.create(
-                path=path,
-                content=c,
-                order=i + 1,
-                is_unlocked=(c.min_level <= level),
-            )
-        return path
\ No newline at end of file
+        take(index.starting_between(lo=level + 1))
+
+        by_id = LearningContent.objects.filter(is_active=True).only("id", "min_level").in_bulk(chosen)
+        contents = [by_id[content_id] for content_id in chosen if content_id in by_id]
+
+        LearningPathItem.objects.bulk_create(
+            [
+                LearningPathItem(
+                    path=path,
+                    content=c,
+                    order=i + 1,
+                    is_unlocked=(c.min_level <= level),
+                )
+                for i, c in enumerate(contents)
+            ]
+        )
+        return path
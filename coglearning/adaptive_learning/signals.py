@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .level_index import invalidate_level_index
+from .models import LearningContent
+
+
+@receiver(post_save, sender=LearningContent)
+@receiver(post_delete, sender=LearningContent)
+def refresh_level_index(sender, instance, **kwargs):
+    invalidate_level_index()
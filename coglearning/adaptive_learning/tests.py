@@ -1,7 +1,18 @@
+import random
+
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from accounts.models import User
-from adaptive_learning.models import LearningContent
+from adaptive_learning.models import ContentRecommendation, LearningContent, LearningPath, UserContentProgress
+from adaptive_learning.level_index import get_level_index
+from adaptive_learning.services import AdaptiveLearningEngine, sample_ids
 
 
 class AdaptiveLearningAPITests(APITestCase):
@@ -83,3 +94,222 @@ class AdaptiveLearningAPITests(APITestCase):
         res = self.client.get('/api/adaptive-learning/teacher/contents/')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(res.data), 1)
+
+
+class SampleIdsTests(SimpleTestCase):
+    def test_samples_distinct_members_and_skips_excluded(self):
+        population = list(range(100))
+        picked = sample_ids(population, 10, exclude={0, 1, 2}, rng=random.Random(7))
+        self.assertEqual(len(picked), 10)
+        self.assertEqual(len(set(picked)), 10)
+        self.assertFalse({0, 1, 2} & set(picked))
+
+    def test_returns_everything_left_when_population_is_small(self):
+        picked = sample_ids([5, 6, 7], 10, exclude={6}, rng=random.Random(1))
+        self.assertEqual(sorted(picked), [5, 7])
+
+
+class RecommendationSamplingTests(APITestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='sample_teacher', password='pass12345', role='teacher')
+        self.student = User.objects.create_user(
+            username='sample_student', password='pass12345', role='student',
+            cognitive_level=40, has_taken_placement_test=True,
+        )
+        self.in_band = [
+            LearningContent.objects.create(
+                title=f'Band {i}', content_type='text', min_level=30 + i, max_level=60,
+                author=self.teacher,
+            )
+            for i in range(15)
+        ]
+        LearningContent.objects.create(
+            title='Too hard', content_type='text', min_level=80, max_level=100, author=self.teacher,
+        )
+
+    def test_recommendations_are_sampled_from_band_without_order_by_random(self):
+        done = self.in_band[0]
+        UserContentProgress.objects.create(user=self.student, content=done, progress_percent=100, is_completed=True)
+        with CaptureQueriesContext(connection) as ctx:
+            AdaptiveLearningEngine.generate_recommendations(self.student)
+        self.assertFalse(any('RANDOM()' in q['sql'].upper() for q in ctx.captured_queries))
+
+        ids = set(ContentRecommendation.objects.filter(user=self.student).values_list('content_id', flat=True))
+        self.assertEqual(len(ids), 10)
+        self.assertTrue(ids <= {c.id for c in self.in_band[1:]})
+
+
+class LevelIndexTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='level_teacher', password='pass12345', role='teacher')
+        self.student = User.objects.create_user(
+            username='level_student', password='pass12345', role='student',
+            cognitive_level=30, has_taken_placement_test=True,
+        )
+
+    def make(self, title, min_level, max_level, **kwargs):
+        return LearningContent.objects.create(
+            title=title, content_type='text', min_level=min_level, max_level=max_level,
+            author=self.teacher, **kwargs
+        )
+
+    def test_index_follows_content_writes(self):
+        a = self.make('A', 10, 40)
+        b = self.make('B', 35, 50)
+        self.assertEqual(get_level_index().overlapping(30, 30, ordered=True), [a.id])
+        b.min_level = 25
+        b.save()
+        self.assertEqual(get_level_index().overlapping(30, 30, ordered=True), [a.id, b.id])
+        a.is_active = False
+        a.save()
+        self.assertEqual(get_level_index().overlapping(30, 30, ordered=True), [b.id])
+        b.delete()
+        self.assertEqual(get_level_index().overlapping(1, 100), [])
+
+    def test_path_and_roadmap_follow_level_order(self):
+        inside = self.make('Inside', 20, 40)
+        below = self.make('Below', 5, 10)
+        above = self.make('Above', 60, 80)
+        done = self.make('Done', 25, 35)
+        self.make('Hidden', 1, 100, is_active=False)
+        UserContentProgress.objects.create(user=self.student, content=done, progress_percent=100, is_completed=True)
+
+        path = AdaptiveLearningEngine.create_or_refresh_path(self.student)
+        items = list(path.items.order_by('order').values_list('content_id', 'is_unlocked'))
+        self.assertEqual(items, [(inside.id, True), (below.id, True), (above.id, False)])
+
+        self.client.force_authenticate(user=self.student)
+        res = self.client.get('/api/adaptive-learning/learning-roadmap/?limit=2')
+        self.assertEqual([step['id'] for step in res.data['steps']], [below.id, inside.id])
+
+
+class ClickBackfillTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='click_teacher', password='pass12345', role='teacher')
+        self.student = User.objects.create_user(
+            username='click_student', password='pass12345', role='student',
+            cognitive_level=20, has_taken_placement_test=True,
+        )
+        self.content = LearningContent.objects.create(
+            title='Legacy', content_type='text', min_level=1, max_level=50, author=self.teacher,
+        )
+        # کلیک قدیمی: فقط is_clicked بدون ردیف پیشرفت
+        ContentRecommendation.objects.create(
+            user=self.student, content=self.content, recommendation_type='legacy', is_clicked=True,
+        )
+
+    def test_progress_get_backfills_once(self):
+        self.client.force_authenticate(user=self.student)
+        res = self.client.get('/api/adaptive-learning/progress/')
+        rows = res.data if isinstance(res.data, list) else res.data.get('results', [])
+        self.assertTrue(any(r['content'] == self.content.id and r['is_completed'] for r in rows))
+        self.student.refresh_from_db()
+        self.assertTrue(self.student.recommendation_clicks_backfilled)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/adaptive-learning/progress/')
+        writes = [q['sql'] for q in ctx.captured_queries if not q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertEqual(writes, [])
+        self.assertEqual(UserContentProgress.objects.filter(user=self.student).count(), 1)
+
+    def test_command_backfills_pending_users(self):
+        UserContentProgress.objects.create(user=self.student, content=self.content, progress_percent=40)
+        out = StringIO()
+        call_command('backfill_clicked_progress', stdout=out)
+        progress = UserContentProgress.objects.get(user=self.student, content=self.content)
+        self.assertTrue(progress.is_completed)
+        self.assertEqual(progress.progress_percent, 100)
+        self.assertTrue(User.objects.get(pk=self.student.pk).recommendation_clicks_backfilled)
+        self.assertFalse(User.objects.filter(recommendation_clicks_backfilled=False).exists())
+
+
+class PrecomputedRecommendationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='batch_teacher', password='pass12345', role='teacher')
+        self.contents = [
+            LearningContent.objects.create(
+                title=f'Batch {i}', content_type='text', min_level=1, max_level=100, author=self.teacher,
+            )
+            for i in range(12)
+        ]
+        self.students = [
+            User.objects.create_user(
+                username=f'batch_student_{i}', password='pass12345', role='student',
+                cognitive_level=10 + i, has_taken_placement_test=True,
+            )
+            for i in range(5)
+        ]
+
+    def test_chunk_cost_does_not_grow_with_students(self):
+        get_level_index()
+        with CaptureQueriesContext(connection) as small:
+            AdaptiveLearningEngine.precompute_recommendations(self.students[:1])
+        ContentRecommendation.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            AdaptiveLearningEngine.precompute_recommendations(self.students)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        for student in self.students:
+            self.assertEqual(ContentRecommendation.objects.filter(user=student).count(), 10)
+
+    def test_command_keeps_clicks_and_drops_completed(self):
+        student = self.students[0]
+        clicked = ContentRecommendation.objects.create(
+            user=student, content=self.contents[0], recommendation_type='old', is_clicked=True,
+        )
+        done = ContentRecommendation.objects.create(user=student, content=self.contents[1], recommendation_type='old')
+        UserContentProgress.objects.create(user=student, content=self.contents[1], progress_percent=100, is_completed=True)
+
+        call_command('precompute_recommendations', '--chunk-size', '2', stdout=StringIO())
+        rows = ContentRecommendation.objects.filter(user=student)
+        self.assertTrue(rows.filter(pk=clicked.pk, is_clicked=True).exists())
+        self.assertFalse(rows.filter(pk=done.pk).exists())
+        self.assertEqual(rows.count(), 10)
+        self.assertEqual(ContentRecommendation.objects.count(), 50)
+
+    def test_read_path_uses_precomputed_rows(self):
+        student, newcomer = self.students[0], self.students[1]
+        AdaptiveLearningEngine.precompute_recommendations([student])
+        student.recommendation_clicks_backfilled = True
+        self.client.force_authenticate(user=student)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get('/api/adaptive-learning/recommended/')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(q['sql'].lstrip().upper().startswith('SELECT') for q in ctx.captured_queries))
+
+        self.client.force_authenticate(user=newcomer)
+        res = self.client.get('/api/adaptive-learning/recommended/')
+        rows = res.data if isinstance(res.data, list) else res.data.get('results', [])
+        self.assertEqual(len(rows), 10)
+
+
+class LearningPathBuildTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='path_teacher', password='pass12345', role='teacher')
+        self.student = User.objects.create_user(
+            username='path_student', password='pass12345', role='student',
+            cognitive_level=50, has_taken_placement_test=True,
+        )
+        for i in range(15):
+            LearningContent.objects.create(
+                title=f'Step {i}', content_type='text', min_level=40 + i, max_level=70, author=self.teacher,
+            )
+
+    def build(self, length):
+        with override_settings(LEARNING_PATH_LENGTH=length):
+            get_level_index()
+            with CaptureQueriesContext(connection) as ctx:
+                path = AdaptiveLearningEngine.create_or_refresh_path(self.student)
+        return path, len(ctx.captured_queries)
+
+    def test_path_cost_does_not_grow_with_length(self):
+        short, short_queries = self.build(3)
+        long, long_queries = self.build(12)
+        self.assertEqual(short_queries, long_queries)
+        self.assertEqual(short.items.count(), 3)
+        self.assertEqual(long.items.count(), 12)
+        self.assertEqual(list(long.items.order_by('order').values_list('order', flat=True)), list(range(1, 13)))
+        self.assertFalse(LearningPath.objects.filter(pk=short.pk, is_active=True).exists())
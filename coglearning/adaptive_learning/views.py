@@ -14,8 +14,14 @@ class RecommendedContentView(generics.ListAPIView):
     serializer_class = RecommendationSerializer
     permission_classes = [permissions.IsAuthenticated, HasTakenPlacementTest]
     def get_queryset(self):
-        AdaptiveLearningEngine.generate_recommendations(self.request.user)
-        return ContentRecommendation.objects.filter(user=self.request.user)
+        # Rows are precomputed nightly (precompute_recommendations); generate on
+        # demand only for brand-new users or when every stored row is used up.
+        user = self.request.user
+        AdaptiveLearningEngine.backfill_clicked_progress(user)
+        recommendations = AdaptiveLearningEngine.visible_recommendations(user)
+        if not recommendations.exists():
+            AdaptiveLearningEngine.generate_recommendations(user)
+        return recommendations
 
 class LearningPathView(generics.RetrieveAPIView):
     serializer_class = LearningPathSerializer
@@ -74,9 +80,8 @@ class UserProgressListView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        # Older «خوانده شد» clicks only set is_clicked — promote them into progress rows.
-        for rec in ContentRecommendation.objects.filter(user=user, is_clicked=True).select_related("content"):
-            AdaptiveLearningEngine.record_content_completed(user, rec.content)
+        # Older «خوانده شد» clicks only set is_clicked — promoted into progress rows once per user.
+        AdaptiveLearningEngine.backfill_clicked_progress(user)
         return UserContentProgress.objects.filter(user=user).select_related("content").order_by("-last_accessed")
 
 class RecommendationsListView(generics.ListAPIView):
@@ -10,16 +10,44 @@ from .catalog import (
     VALID_SORT_FIELDS,
     process_catalog,
 )
-from .searching import binary_search, linear_search
-from .sorting import bubble_sort, merge_sort
+from .columnar import ColumnarCatalog
+from .levels import LevelIndex
+from .indexing import CatalogIndex
+from .snapshots import CatalogSnapshot
+from .searching import (
+    binary_search,
+    binary_search_range,
+    linear_search,
+    lower_bound,
+    upper_bound,
+)
+from .sorting import (
+    bubble_sort,
+    compile_sort_key,
+    merge_sort,
+    merge_sort_iterative,
+    parse_sort_spec,
+    partial_sort,
+)
 from .utils import get_item_value
 
 __all__ = [
     "process_catalog",
+    "CatalogSnapshot",
+    "ColumnarCatalog",
+    "LevelIndex",
     "bubble_sort",
     "merge_sort",
+    "merge_sort_iterative",
+    "partial_sort",
+    "parse_sort_spec",
+    "compile_sort_key",
     "linear_search",
     "binary_search",
+    "binary_search_range",
+    "lower_bound",
+    "upper_bound",
+    "CatalogIndex",
     "get_item_value",
     "SORT_ALGORITHMS",
     "SEARCH_ALGORITHMS",
@@ -0,0 +1,124 @@
+"""Columnar (NumPy-backed) catalog: vectorized level filtering and argsort ordering."""
+
+import sys
+
+from .normalization import collation_key
+from .searching import linear_search
+from .utils import get_item_value
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency — process_catalog works without it
+    np = None
+
+NUMERIC_FIELDS = ("min_level", "time_limit_minutes")
+DATETIME_FIELDS = ("created_at",)
+
+
+def numpy_available():
+    return np is not None
+
+
+def _datetime64(value):
+    if value is None or value == "":
+        return np.datetime64("NaT", "us")
+    if getattr(value, "tzinfo", None) is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return np.datetime64(value, "us")
+
+
+class ColumnarCatalog:
+    """
+    A catalog stored column-wise: ``min_level``/``time_limit_minutes`` as int64
+    arrays, ``created_at`` as datetime64, titles (and any extra ``string_fields``)
+    as arrays of interned collation keys, plus an ``id`` column.
+
+    A catalog is a *view*: an array of row positions over shared columns and the
+    original objects. ``filter``/``order_by``/slicing return new views without
+    copying columns or objects; ``to_list()`` maps back to the original items.
+    """
+
+    def __init__(self, items, string_fields=("title",), version=0, _columns=None, _rows=None):
+        if np is None:
+            raise ImportError("ColumnarCatalog requires numpy")
+        self.version = version
+        if _columns is not None:
+            self._items, self._columns = items, _columns
+            self.rows = _rows
+            return
+
+        self._items = list(items)
+        n = len(self._items)
+        columns = {
+            "id": np.array([get_item_value(item, "id") for item in self._items], dtype=object),
+        }
+        for field in NUMERIC_FIELDS:
+            columns[field] = np.fromiter(
+                (get_item_value(item, field) or 0 for item in self._items), dtype=np.int64, count=n,
+            )
+        for field in DATETIME_FIELDS:
+            columns[field] = np.array(
+                [_datetime64(get_item_value(item, field)) for item in self._items], dtype="datetime64[us]",
+            )
+        for field in string_fields:
+            columns[field] = np.array(
+                [sys.intern(collation_key(get_item_value(item, field))) for item in self._items], dtype=object,
+            )
+        self._columns = columns
+        self.rows = np.arange(n, dtype=np.int64)
+
+    def _view(self, rows):
+        return ColumnarCatalog(self._items, version=self.version, _columns=self._columns, _rows=rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        items = self._items
+        return (items[i] for i in self.rows.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._view(self.rows[index])
+        return self._items[int(self.rows[index])]
+
+    def to_list(self):
+        items = self._items
+        return [items[i] for i in self.rows.tolist()]
+
+    def has_column(self, field):
+        return field in self._columns
+
+    def column(self, field):
+        """Values of ``field`` for the rows in this view (a fresh array)."""
+        return self._columns[field][self.rows]
+
+    def filter(self, mask):
+        """Keep rows where the boolean ``mask`` (aligned with this view) is true."""
+        return self._view(self.rows[mask])
+
+    def filter_level(self, level, field="min_level"):
+        """Rows a user at ``level`` may take: ``field <= level`` (vectorized)."""
+        return self.filter(self.column(field) <= level)
+
+    def filter_ids(self, ids):
+        return self.filter(np.isin(self.column("id"), list(ids)))
+
+    def order_by(self, field, reverse=False):
+        """Stable argsort on one column; ties keep their current order either way."""
+        values = self.column(field)
+        if not reverse:
+            order = np.argsort(values, kind="stable")
+        else:
+            n = len(values)
+            order = (n - 1 - np.argsort(values[::-1], kind="stable"))[::-1]
+        return self._view(self.rows[order])
+
+    def search(self, query, index=None):
+        """Substring search; with a CatalogIndex only the id column is touched."""
+        if not query:
+            return self
+        if index is not None:
+            return self.filter_ids(index.search(query))
+        positions = linear_search(self.to_list(), query)
+        return self._view(self.rows[np.asarray(positions, dtype=np.int64)])
@@ -0,0 +1,106 @@
+"""Inverted n-gram index for catalog search (title/description substrings)."""
+
+import threading
+
+from .normalization import normalize_text
+from .utils import get_item_value
+
+GRAM_SIZE = 3
+
+
+def _grams(text, size=GRAM_SIZE):
+    """Every distinct substring of length 1..size (short queries hit postings directly)."""
+    grams = set()
+    n = len(text)
+    for start in range(n):
+        for length in range(1, size + 1):
+            if start + length > n:
+                break
+            grams.add(text[start:start + length])
+    return grams
+
+
+class CatalogIndex:
+    """
+    Persistent inverted index: n-gram → item ids.
+
+    Answers the same question as ``linear_search`` (case-insensitive substring
+    on any field) without scanning every item: queries up to ``GRAM_SIZE``
+    characters are a single posting lookup, longer ones intersect trigram
+    postings and verify only the surviving candidates.
+    """
+
+    def __init__(self, fields=("title", "description")):
+        self.fields = tuple(fields)
+        self._postings = {}
+        self._texts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_items(cls, items, fields=("title", "description")):
+        """Build a throwaway index keyed by list position."""
+        index = cls(fields=fields)
+        for i, item in enumerate(items):
+            index.add(i, item)
+        return index
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, item_id):
+        return item_id in self._texts
+
+    def add(self, item_id, item):
+        """Index (or re-index) one item under ``item_id``."""
+        texts = tuple(normalize_text(get_item_value(item, f)) for f in self.fields)
+        with self._lock:
+            self._discard(item_id)
+            self._texts[item_id] = texts
+            for text in texts:
+                for gram in _grams(text):
+                    self._postings.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._discard(item_id)
+
+    def _discard(self, item_id):
+        texts = self._texts.pop(item_id, None)
+        if texts is None:
+            return
+        for text in texts:
+            for gram in _grams(text):
+                ids = self._postings.get(gram)
+                if ids is None:
+                    continue
+                ids.discard(item_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(self, query):
+        """Return the set of ids whose fields contain ``query`` (empty query → all)."""
+        query_lower = normalize_text(query)
+        with self._lock:
+            if not query_lower:
+                return set(self._texts)
+            if len(query_lower) <= GRAM_SIZE:
+                return set(self._postings.get(query_lower, ()))
+
+            postings = []
+            for start in range(len(query_lower) - GRAM_SIZE + 1):
+                ids = self._postings.get(query_lower[start:start + GRAM_SIZE])
+                if not ids:
+                    return set()
+                postings.append(ids)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                candidates &= ids
+                if not candidates:
+                    return candidates
+
+            return {
+                item_id
+                for item_id in candidates
+                if any(query_lower in text for text in self._texts[item_id])
+            }
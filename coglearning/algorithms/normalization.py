@@ -0,0 +1,47 @@
+"""Persian-aware text normalization and collation keys for catalog search/sort."""
+
+PERSIAN_ALPHABET = "آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی"
+
+_CHAR_MAP = {
+    "ي": "ی",   # Arabic yeh
+    "ى": "ی",   # alef maksura
+    "ك": "ک",   # Arabic kaf
+    "ۀ": "ه",
+    "ة": "ه",
+    "أ": "ا",
+    "إ": "ا",
+    "ٱ": "ا",
+    "\u200c": " ",  # ZWNJ (half-space) → space, so "می\u200cرود" and "می رود" match
+    "\u200d": "",  # ZWJ
+    "\u200e": "",  # LRM
+    "\u200f": "",  # RLM
+    "ـ": "",    # tatweel
+}
+_CHAR_MAP.update({chr(cp): "" for cp in range(0x064B, 0x0653)})  # harakat
+_CHAR_MAP[chr(0x0670)] = ""
+_CHAR_MAP.update({persian: str(d) for d, persian in enumerate("۰۱۲۳۴۵۶۷۸۹")})
+_CHAR_MAP.update({arabic: str(d) for d, arabic in enumerate("٠١٢٣٤٥٦٧٨٩")})
+_NORMALIZE = str.maketrans(_CHAR_MAP)
+
+# Persian letters → private-use code points in alphabet order (پ/چ/ژ/گ/ک/ی
+# otherwise sort after the Arabic block by raw code point).
+_COLLATE = str.maketrans({letter: chr(0xE000 + rank) for rank, letter in enumerate(PERSIAN_ALPHABET)})
+
+
+def normalize_text(value):
+    """
+    Canonical search form: unified ی/ک, no diacritics or tatweel, ASCII
+    digits, ZWNJ as a space, collapsed whitespace, lower-cased.
+    """
+    text = str(value).translate(_NORMALIZE).lower()
+    return " ".join(text.split())
+
+
+def collation_key(value):
+    """Sort key for a string: ``normalize_text`` with Persian letters in alphabet order."""
+    return normalize_text(value).translate(_COLLATE)
+
+
+def search_key(*values):
+    """Normalized search text for several fields (one line each, so matches never span fields)."""
+    return "\n".join(normalize_text(value) for value in values)
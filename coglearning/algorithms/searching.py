@@ -1,5 +1,6 @@
 """Manual search algorithms for the cognitive test catalog."""
 
+from .normalization import collation_key, normalize_text
 from .utils import get_item_value
 
 
@@ -11,11 +12,11 @@ def linear_search(items, query, fields=("title", "description")):
     if not query:
         return list(range(len(items)))
 
-    query_lower = str(query).lower()
+    query_lower = normalize_text(query)
     matches = []
     for i in range(len(items)):
         for field in fields:
-            value = str(get_item_value(items[i], field)).lower()
+            value = normalize_text(get_item_value(items[i], field))
             if query_lower in value:
                 matches.append(i)
                 break
@@ -44,3 +45,85 @@ def binary_search(items, query, key="title"):
         else:
             right = mid - 1
     return -1
+
+
+# --- Range search (bisect-style bounds over a sorted list) ---
+
+_PREFIX_SENTINEL = "\U0010ffff"
+
+
+def normalize_key(value):
+    """Comparable search key: collation keys for strings, ISO timestamps, raw numbers."""
+    if isinstance(value, str):
+        return collation_key(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def normalized_key(field):
+    """Key callable for sorting a list in the order range search expects."""
+    return lambda item: normalize_key(get_item_value(item, field))
+
+
+def _query_key(query, sample):
+    """Coerce a raw query to the type of the field it is compared against."""
+    if isinstance(sample, bool) or not isinstance(sample, (int, float)):
+        if isinstance(sample, str):
+            return collation_key(query)
+        return str(query)
+    try:
+        number = float(query)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(sample, int) and number.is_integer():
+        return int(number)
+    return number
+
+
+def lower_bound(items, target, key="title"):
+    """First index whose normalized key is >= target (bisect_left)."""
+    left = 0
+    right = len(items)
+    while left < right:
+        mid = (left + right) // 2
+        if normalize_key(get_item_value(items[mid], key)) < target:
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+
+def upper_bound(items, target, key="title"):
+    """First index whose normalized key is > target (bisect_right)."""
+    left = 0
+    right = len(items)
+    while left < right:
+        mid = (left + right) // 2
+        if target < normalize_key(get_item_value(items[mid], key)):
+            right = mid
+        else:
+            left = mid + 1
+    return left
+
+
+def binary_search_range(items, query, key="title", prefix=False):
+    """
+    Binary Search (range) — all matches on a list sorted by ``normalized_key(key)``.
+    Returns ``(start, end)`` so ``items[start:end]`` is every exact match, or
+    every key starting with ``query`` when ``prefix`` is set (string keys only).
+    O(log n) to locate the slice.
+    """
+    if not query or len(items) == 0:
+        return 0, 0
+
+    target = _query_key(query, get_item_value(items[0], key))
+    if target is None:
+        return 0, 0
+
+    start = lower_bound(items, target, key)
+    if prefix and isinstance(target, str):
+        end = lower_bound(items, target + _PREFIX_SENTINEL, key)
+    else:
+        end = upper_bound(items, target, key)
+    return start, end
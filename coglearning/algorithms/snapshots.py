@@ -0,0 +1,74 @@
+"""Versioned, pre-sorted catalog snapshots (one sorted array per sort field)."""
+
+from .catalog import VALID_SORT_FIELDS
+from .searching import binary_search_range, normalized_key
+from .sorting import merge_sort
+from .utils import get_item_value
+
+
+class CatalogSnapshot:
+    """
+    Sort every field once, then answer many requests from the sorted arrays.
+
+    Rows are lightweight ``{"id", <field>...}`` projections ordered by
+    ``normalized_key(field)``. Requests pass their own (possibly filtered)
+    items; results are those items, matched by ``id``, in snapshot order.
+    When a request holds an item the snapshot does not know about, the
+    methods return None so the caller can fall back to sorting manually.
+    """
+
+    def __init__(self, items, version=0, fields=VALID_SORT_FIELDS):
+        self.version = version
+        self.fields = tuple(fields)
+        rows = [
+            dict({"id": get_item_value(item, "id")}, **{f: get_item_value(item, f) for f in self.fields})
+            for item in items
+        ]
+        self._ids = {row["id"] for row in rows}
+        self._sorted = {f: merge_sort(rows, key=normalized_key(f), decorate=True) for f in self.fields}
+        # stable descending arrays: ties keep row order, exactly like merge_sort(reverse=True)
+        self._sorted_desc = {
+            f: merge_sort(rows, key=normalized_key(f), reverse=True, decorate=True) for f in self.fields
+        }
+
+    def __len__(self):
+        return len(self._ids)
+
+    def sorted_by(self, field):
+        return self._sorted[field]
+
+    def _by_id(self, items):
+        by_id = {}
+        for item in items:
+            item_id = get_item_value(item, "id")
+            if item_id not in self._ids:
+                return None
+            by_id[item_id] = item
+        return by_id
+
+    def order(self, items, field, reverse=False, limit=None):
+        """
+        ``items`` in snapshot order for ``field`` — O(N), no comparisons.
+        With ``limit`` the walk stops as soon as that many items are found.
+        """
+        by_id = self._by_id(items)
+        if by_id is None or field not in self._sorted:
+            return None
+        rows = self._sorted_desc[field] if reverse else self._sorted[field]
+        ordered = []
+        for row in rows:
+            if limit is not None and len(ordered) >= limit:
+                break
+            item = by_id.get(row["id"])
+            if item is not None:
+                ordered.append(item)
+        return ordered
+
+    def search(self, items, query, field, prefix=False):
+        """Range search on the pre-sorted ``field`` array, restricted to ``items``."""
+        by_id = self._by_id(items)
+        if by_id is None or field not in self._sorted:
+            return None
+        rows = self._sorted[field]
+        start, end = binary_search_range(rows, query, key=field, prefix=prefix)
+        return [by_id[row["id"]] for row in rows[start:end] if row["id"] in by_id]
@@ -1,5 +1,7 @@
 """Manual sorting algorithms for the cognitive test catalog (no built-in sort)."""
 
+from functools import lru_cache
+
 from .utils import get_item_value
 
 
@@ -9,13 +11,41 @@ def _should_swap(a, b, reverse):
     return a > b
 
 
-def bubble_sort(items, key="title", reverse=False):
-    """Bubble Sort — O(n²) comparison-based sort."""
+def _extract_keys(arr, key):
+    """Decorate: read each item's sort key once into a parallel list."""
+    return [get_item_value(item, key) for item in arr]
+
+
+def _bubble_sort_indices(keys, reverse):
+    order = list(range(len(keys)))
+    n = len(order)
+    for i in range(n):
+        swapped = False
+        for j in range(0, n - i - 1):
+            if _should_swap(keys[order[j]], keys[order[j + 1]], reverse):
+                order[j], order[j + 1] = order[j + 1], order[j]
+                swapped = True
+        if not swapped:
+            break
+    return order
+
+
+def bubble_sort(items, key="title", reverse=False, decorate=False):
+    """
+    Bubble Sort — O(n²) comparison-based sort.
+
+    ``decorate=True`` extracts keys once and bubbles an index array over
+    them (decorate-sort-undecorate) instead of reading item fields per comparison.
+    """
     arr = list(items)
     n = len(arr)
     if n <= 1:
         return arr
 
+    if decorate:
+        order = _bubble_sort_indices(_extract_keys(arr, key), reverse)
+        return [arr[i] for i in order]
+
     for i in range(n):
         swapped = False
         for j in range(0, n - i - 1):
@@ -51,14 +81,252 @@ def _merge(left, right, key, reverse):
     return result
 
 
-def merge_sort(items, key="title", reverse=False):
-    """Merge Sort — divide-and-conquer recursive sort."""
+def _merge_indices(left, right, keys, reverse):
+    result = []
+    i = 0
+    j = 0
+    while i < len(left) and j < len(right):
+        val_left = keys[left[i]]
+        val_right = keys[right[j]]
+        if reverse:
+            take_left = val_left >= val_right
+        else:
+            take_left = val_left <= val_right
+        if take_left:
+            result.append(left[i])
+            i += 1
+        else:
+            result.append(right[j])
+            j += 1
+    result.extend(left[i:])
+    result.extend(right[j:])
+    return result
+
+
+def _merge_sort_indices(order, keys, reverse):
+    n = len(order)
+    if n <= 1:
+        return order
+    mid = n // 2
+    left = _merge_sort_indices(order[:mid], keys, reverse)
+    right = _merge_sort_indices(order[mid:], keys, reverse)
+    return _merge_indices(left, right, keys, reverse)
+
+
+def merge_sort(items, key="title", reverse=False, decorate=False):
+    """
+    Merge Sort — divide-and-conquer recursive sort.
+
+    ``decorate=True`` merges an index array over keys extracted once
+    (decorate-sort-undecorate); output and stability are unchanged.
+    """
     arr = list(items)
     n = len(arr)
     if n <= 1:
         return arr
 
+    if decorate:
+        keys = _extract_keys(arr, key)
+        order = _merge_sort_indices(list(range(n)), keys, reverse)
+        return [arr[i] for i in order]
+
     mid = n // 2
     left = merge_sort(arr[:mid], key=key, reverse=reverse)
     right = merge_sort(arr[mid:], key=key, reverse=reverse)
     return _merge(left, right, key, reverse)
+
+
+def merge_sort_iterative(items, key="title", reverse=False, decorate=False):
+    """
+    Merge Sort (bottom-up) — iterative, stable, no recursion.
+
+    Merges runs of width 1, 2, 4, ... ping-ponging between two preallocated
+    buffers, so there are no per-merge allocations and no recursion limit.
+    """
+    arr = list(items)
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    if decorate:
+        keys = _extract_keys(arr, key)
+    else:
+        keys = None
+
+    src = list(range(n))
+    dst = [0] * n
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i = lo
+            j = mid
+            k = lo
+            while i < mid and j < hi:
+                if keys is None:
+                    val_left = get_item_value(arr[src[i]], key)
+                    val_right = get_item_value(arr[src[j]], key)
+                else:
+                    val_left = keys[src[i]]
+                    val_right = keys[src[j]]
+                if reverse:
+                    take_left = val_left >= val_right
+                else:
+                    take_left = val_left <= val_right
+                if take_left:
+                    dst[k] = src[i]
+                    i += 1
+                else:
+                    dst[k] = src[j]
+                    j += 1
+                k += 1
+            while i < mid:
+                dst[k] = src[i]
+                i += 1
+                k += 1
+            while j < hi:
+                dst[k] = src[j]
+                j += 1
+                k += 1
+        src, dst = dst, src
+        width *= 2
+    return [arr[i] for i in src]
+
+
+def _sift_up(heap, pos, after):
+    while pos > 0:
+        parent = (pos - 1) // 2
+        if not after(heap[pos], heap[parent]):
+            break
+        heap[pos], heap[parent] = heap[parent], heap[pos]
+        pos = parent
+
+
+def _sift_down(heap, pos, after):
+    n = len(heap)
+    while True:
+        child = 2 * pos + 1
+        if child >= n:
+            break
+        if child + 1 < n and after(heap[child + 1], heap[child]):
+            child += 1
+        if not after(heap[child], heap[pos]):
+            break
+        heap[pos], heap[child] = heap[child], heap[pos]
+        pos = child
+
+
+def partial_sort(items, k, key="title", reverse=False):
+    """
+    Top-k selection — the first ``k`` items of the stable sorted order.
+
+    Keeps a bounded max-heap of the best ``k`` candidates (root = the one
+    that sorts last), so only O(n log k) comparisons are needed when a
+    page of results is requested. Ties keep input order, exactly like
+    merge_sort. ``items`` may be any iterable: it is consumed once and
+    only the ``k`` current candidates are held in memory.
+    """
+    if hasattr(items, "__len__") and k >= len(items):
+        return merge_sort(list(items), key=key, reverse=reverse, decorate=True)
+    if k <= 0:
+        return []
+
+    keys = {}
+    kept = {}
+
+    def after(a, b):
+        if keys[a] == keys[b]:
+            return a > b
+        return _should_swap(keys[a], keys[b], reverse)
+
+    heap = []
+    for idx, item in enumerate(items):
+        keys[idx] = get_item_value(item, key)
+        if len(heap) < k:
+            kept[idx] = item
+            heap.append(idx)
+            _sift_up(heap, len(heap) - 1, after)
+        elif after(heap[0], idx):
+            evicted = heap[0]
+            del keys[evicted], kept[evicted]
+            kept[idx] = item
+            heap[0] = idx
+            _sift_down(heap, 0, after)
+        else:
+            del keys[idx]
+
+    order = [0] * len(heap)
+    for pos in range(len(heap) - 1, -1, -1):
+        order[pos] = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            _sift_down(heap, 0, after)
+    return [kept[i] for i in order]
+
+
+# --- Composite sort specs ("min_level,-created_at") ---
+
+class _Descending:
+    """Wraps one key component so it compares in the opposite direction."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __le__(self, other):
+        return other.value <= self.value
+
+    def __gt__(self, other):
+        return other.value > self.value
+
+    def __ge__(self, other):
+        return other.value >= self.value
+
+    def __repr__(self):
+        return f"-{self.value!r}"
+
+
+def parse_sort_spec(spec, valid_fields=None):
+    """
+    Parse ``"min_level,-created_at"`` into ``(("min_level", False), ("created_at", True))``.
+    A leading ``-`` means descending; unknown or repeated fields are dropped.
+    """
+    parsed = []
+    seen = set()
+    for part in str(spec or "").split(","):
+        part = part.strip()
+        descending = part.startswith("-")
+        field = part.lstrip("+-").strip()
+        if not field or field in seen:
+            continue
+        if valid_fields is not None and field not in valid_fields:
+            continue
+        seen.add(field)
+        parsed.append((field, descending))
+    return tuple(parsed)
+
+
+@lru_cache(maxsize=128)
+def compile_sort_key(spec):
+    """
+    Compile parsed spec pairs into one key callable returning a tuple, so any
+    sorter gets the full multi-key, mixed-direction order in a single pass.
+    """
+    fields = tuple(spec)
+
+    def key(item):
+        return tuple(
+            _Descending(get_item_value(item, field)) if descending else get_item_value(item, field)
+            for field, descending in fields
+        )
+
+    return key
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AssessmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assessment'
+
+    def ready(self):
+        import assessment.signals  # noqa: F401
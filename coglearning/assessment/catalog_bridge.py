@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
 from pathlib import Path
 
 _SILVER_ROOT = Path(__file__).resolve().parents[2] / "silver_project"
@@ -9,17 +12,272 @@ if _SILVER_ROOT.is_dir() and str(_SILVER_ROOT) not in sys.path:
     sys.path.insert(0, str(_SILVER_ROOT))
 
 from algorithms.catalog import process_catalog  # noqa: E402
+from algorithms.catalog import VALID_SORT_FIELDS  # noqa: E402
+from algorithms.columnar import ColumnarCatalog, numpy_available  # noqa: E402
+from algorithms.indexing import CatalogIndex  # noqa: E402
+from algorithms.normalization import collation_key, normalize_text, search_key  # noqa: E402
+from algorithms.snapshots import CatalogSnapshot  # noqa: E402
 
+# Per-process caches, each tagged with the catalog revisions it was built
+# from. The revisions live in the database (assessment.revisions), so a
+# write in any worker makes every worker rebuild on its next read. The
+# search index and snapshot only read test fields and follow the ``tests``
+# revision (CognitiveTest writes); the columnar catalog and response cache
+# also carry questions_count and follow both.
+_catalog_index = None
+_catalog_index_version = None
+_catalog_index_lock = threading.Lock()
+_catalog_snapshot = None
+_columnar_catalog = None
 
-def apply_catalog(items, request):
-    """Apply search/sort from query params; return (items, meta)."""
+
+class ResponseCache:
+    """Small thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize=256, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_response_cache = None
+
+
+CatalogVersion = namedtuple("CatalogVersion", "tests questions")
+
+
+def catalog_version():
+    """Current (tests, questions) revisions in one SELECT; read once per request and pass it on."""
+    from .revisions import TEST_CATALOG, TEST_QUESTIONS, current_revisions
+
+    return CatalogVersion(*current_revisions(TEST_CATALOG, TEST_QUESTIONS))
+
+
+def get_catalog_index(version=None):
+    """Process-wide search index over every CognitiveTest for the current tests revision."""
+    global _catalog_index, _catalog_index_version
+    if version is None:
+        version = catalog_version()
+    version = version.tests
+    if _catalog_index is None or _catalog_index_version != version:
+        with _catalog_index_lock:
+            if _catalog_index is None or _catalog_index_version != version:
+                from .models import CognitiveTest
+
+                index = CatalogIndex()
+                for test in CognitiveTest.objects.only("id", "title", "description").iterator():
+                    index.add(test.id, test)
+                _catalog_index = index
+                _catalog_index_version = version
+    return _catalog_index
+
+
+def get_catalog_snapshot(version=None):
+    """Pre-sorted snapshot of every CognitiveTest for the current tests revision."""
+    global _catalog_snapshot
+    if version is None:
+        version = catalog_version()
+    version = version.tests
+    snapshot = _catalog_snapshot
+    if snapshot is None or snapshot.version != version:
+        from .models import CognitiveTest
+
+        # ties keep id order, the same order the list queryset streams in
+        rows = CognitiveTest.objects.values("id", *VALID_SORT_FIELDS).order_by("id")
+        snapshot = CatalogSnapshot(list(rows), version=version)
+        _catalog_snapshot = snapshot
+    return snapshot
+
+
+def get_columnar_catalog(version=None):
+    """Columnar catalog of every active CognitiveTest for the current revisions (None without numpy)."""
+    global _columnar_catalog
+    if not numpy_available():
+        return None
+    if version is None:
+        version = catalog_version()
+    catalog = _columnar_catalog
+    if catalog is None or catalog.version != version:
+        from django.db.models import Count
+
+        from .models import CognitiveTest
+
+        tests = (
+            CognitiveTest.objects.filter(is_active=True)
+            .select_related('created_by', 'related_content')
+            .annotate(questions_count=Count('questions'))
+            .order_by('id')
+        )
+        catalog = ColumnarCatalog(tests, string_fields=("title", "test_type"), version=version)
+        _columnar_catalog = catalog
+    return catalog
+
+
+def columnar_tests_for(user, version=None):
+    """
+    The StudentTestListView queryset as a columnar view (same role/level rules,
+    evaluated as array masks). None when numpy is missing or the catalog is
+    below CATALOG_COLUMNAR_MIN_ROWS — the caller then uses the queryset.
+    """
+    from django.conf import settings
+
+    catalog = get_columnar_catalog(version)
+    if catalog is None or len(catalog) < getattr(settings, "CATALOG_COLUMNAR_MIN_ROWS", 2000):
+        return None
+    if user.role != 'student':
+        return catalog
+    is_placement = catalog.column("test_type") == 'placement'
+    if not user.has_taken_placement_test:
+        return catalog.filter(is_placement)
+    level = user.cognitive_level or 1
+    return catalog.filter((catalog.column("min_level") <= level) & ~is_placement)
+
+
+def _bump_tests_revision(change):
+    """
+    Bump the shared tests revision. When this process's index was built from
+    the revision being replaced, ``change`` is applied to it in place and it
+    adopts the new token instead of being rebuilt; otherwise (stale index,
+    or a concurrent writer got there first) the next read rebuilds it.
+    """
+    global _catalog_index_version
+    from .revisions import TEST_CATALOG, bump_revision
+
+    index, expected = _catalog_index, _catalog_index_version
+    token, swapped = bump_revision(TEST_CATALOG, expected=expected if index is not None else None)
+    if swapped:
+        with _catalog_index_lock:
+            if _catalog_index is index and _catalog_index_version == expected:
+                change(index)
+                _catalog_index_version = token
+    invalidate_catalog_responses()
+
+
+def index_test(test):
+    """Re-index one test after save and bump the tests revision."""
+    _bump_tests_revision(lambda index: index.add(test.id, test))
+
+
+def unindex_test(test_id):
+    """Drop one test from the index after delete and bump the tests revision."""
+    _bump_tests_revision(lambda index: index.remove(test_id))
+
+
+def invalidate_question_counts():
+    """Bump the questions revision only: the index and snapshot stay, columnar catalog and responses rebuild."""
+    from .revisions import TEST_QUESTIONS, bump_revision
+
+    bump_revision(TEST_QUESTIONS)
+    invalidate_catalog_responses()
+
+
+def get_response_cache():
+    """Process-wide cache of rendered StudentTestListView responses."""
+    global _response_cache
+    if _response_cache is None:
+        from django.conf import settings
+
+        _response_cache = ResponseCache(
+            maxsize=getattr(settings, "CATALOG_CACHE_SIZE", 256),
+            ttl=getattr(settings, "CATALOG_CACHE_TTL", 60),
+        )
+    return _response_cache
+
+
+def invalidate_catalog_responses():
+    """Drop every cached catalog response (test or question written)."""
+    if _response_cache is not None:
+        _response_cache.clear()
+
+
+def text_keys(title, *extra):
+    """(search_key, sort_key) column values for a catalog row."""
+    return search_key(title, *extra), collation_key(title)[:255]
+
+
+def _int_param(params, name):
+    try:
+        return max(0, int(params.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _catalog_options(request):
+    """process_catalog options from query params, falling back to user preferences."""
     params = request.query_params
+    user = request.user
+    return {
+        "query": params.get("q", "") or params.get("query", ""),
+        "sort_algo": params.get("sort_algo") or getattr(user, "preferred_sort_algorithm", "") or "bubble",
+        "search_algo": params.get("search_algo") or getattr(user, "preferred_search_algorithm", "") or "linear",
+        "sort_field": params.get("sort_field") or getattr(user, "default_sort_field", "") or "title",
+        "reverse": params.get("reverse", "").lower() in ("1", "true", "yes"),
+        "prefix": params.get("prefix", "").lower() in ("1", "true", "yes"),
+        "limit": _int_param(params, "limit"),
+        "offset": _int_param(params, "offset") or 0,
+    }
+
+
+def catalog_cache_key(request, version=None):
+    """
+    Responses depend only on who may see which tests (role, placement status,
+    level) and on the resolved catalog options, so users sharing those share
+    one cache entry.
+    """
+    user = request.user
+    if user.role != 'student':
+        audience = ('all',)
+    elif not user.has_taken_placement_test:
+        audience = ('placement',)
+    else:
+        audience = ('level', user.cognitive_level or 1)
+    options = _catalog_options(request)
+    options["query"] = normalize_text(options["query"])
+    options["sort_field"] = options["sort_field"].replace(" ", "")
+    if version is None:
+        version = catalog_version()
+    return (version, audience, tuple(sorted(options.items())))
+
+
+def apply_catalog(items, request, version=None):
+    """Apply search/sort from query params (falling back to user preferences); return (items, meta)."""
+    if version is None:
+        version = catalog_version()
+    options = _catalog_options(request)
+    # Paged requests stream into a bounded top-k heap and never read the
+    # snapshot; only binary search and unpaged sorts need it.
+    use_snapshot = options["search_algo"] == "binary" or options["limit"] is None
     result = process_catalog(
         items,
-        query=params.get("q", "") or params.get("query", ""),
-        sort_algo=params.get("sort_algo", "bubble"),
-        search_algo=params.get("search_algo", "linear"),
-        sort_field=params.get("sort_field", "title"),
-        reverse=params.get("reverse", "").lower() in ("1", "true", "yes"),
+        index=get_catalog_index(version) if options["search_algo"] == "index" else None,
+        snapshot=get_catalog_snapshot(version) if use_snapshot else None,
+        **options,
     )
     return result["items"], result["meta"]
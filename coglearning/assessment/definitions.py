@@ -0,0 +1,78 @@
+"""اسنپ‌شات نسخه‌دار و تغییرناپذیر تعریف آزمون (سؤال‌ها + گزینه‌ها) و کلید پاسخ فشرده آن."""
+
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from rest_framework.renderers import JSONRenderer
+
+# هر نسخه (CognitiveTest.definition_revision) تغییرناپذیر است؛ TTL فقط برای آزاد کردن نسخه‌های قدیمی است
+DEFINITION_TTL = 24 * 60 * 60
+
+# کش درون‌پردازه‌ای کلید پاسخ: test_id → (revision, key)
+_answer_keys = {}
+
+
+def _definition_key(test_id, revision):
+    return f"assessment:test_definition:{test_id}:{revision}"
+
+
+def _answer_key_key(test_id, revision):
+    return f"assessment:answer_key:{test_id}:{revision}"
+
+
+def bump_test_definition(test_id):
+    """
+    نسخه تازه در همان تراکنش تغییر سؤال/گزینه؛ پس از commit همه پردازه‌ها آن را
+    می‌بینند و اسنپ‌شات قبلی دیگر خوانده نمی‌شود.
+    """
+    from .models import CognitiveTest, new_definition_revision
+
+    CognitiveTest.objects.filter(pk=test_id).update(definition_revision=new_definition_revision())
+
+
+def get_test_definition(test):
+    """بایت‌های JSON سریال‌شده CognitiveTestDetailSerializer برای نسخه فعلی آزمون."""
+    from .serializers import CognitiveTestDetailSerializer
+
+    key = _definition_key(test.id, test.definition_revision)
+    payload = cache.get(key)
+    if payload is None:
+        prefetch_related_objects([test], 'questions__choices')
+        payload = JSONRenderer().render(CognitiveTestDetailSerializer(test).data)
+        cache.set(key, payload, DEFINITION_TTL)
+    return payload
+
+
+def load_answer_key(test_id):
+    """کلید پاسخ از دیتابیس: question_id → (category, type, points, شناسه گزینه‌های صحیح)"""
+    from .models import Choice, Question
+
+    correct = {}
+    for choice_id, question_id in Choice.objects.filter(
+        question__test_id=test_id, is_correct=True
+    ).values_list('id', 'question_id'):
+        correct.setdefault(question_id, set()).add(choice_id)
+    return {
+        question_id: (category, question_type, points, frozenset(correct.get(question_id, ())))
+        for question_id, category, question_type, points in Question.objects.filter(
+            test_id=test_id
+        ).values_list('id', 'category', 'question_type', 'points')
+    }
+
+
+def get_answer_key(test):
+    """
+    کلید پاسخ نسخه فعلی آزمون (test.definition_revision): اول کش درون‌پردازه،
+    بعد کش جنگو، در نهایت دیتابیس. نسخه در دیتابیس است، پس تغییر سؤال یا گزینه
+    در هر پردازه‌ای باعث می‌شود کلید قدیمی در همه پردازه‌ها دیگر خوانده نشود.
+    """
+    revision = test.definition_revision
+    hit = _answer_keys.get(test.id)
+    if hit is not None and hit[0] == revision:
+        return hit[1]
+    cache_key = _answer_key_key(test.id, revision)
+    key = cache.get(cache_key)
+    if key is None:
+        key = load_answer_key(test.id)
+        cache.set(cache_key, key, DEFINITION_TTL)
+    _answer_keys[test.id] = (revision, key)
+    return key
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+# Frozen copy of algorithms.normalization as of this migration, so the
+# backfill never depends on live app code (or the silver_project path hack).
+_PERSIAN_ALPHABET = "آابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی"
+_CHAR_MAP = {
+    "ي": "ی", "ى": "ی", "ك": "ک", "ۀ": "ه", "ة": "ه", "أ": "ا", "إ": "ا", "ٱ": "ا",
+    "\u200c": " ", "\u200d": "", "\u200e": "", "\u200f": "", "ـ": "",
+}
+_CHAR_MAP.update({chr(cp): "" for cp in range(0x064B, 0x0653)})
+_CHAR_MAP[chr(0x0670)] = ""
+_CHAR_MAP.update({persian: str(d) for d, persian in enumerate("۰۱۲۳۴۵۶۷۸۹")})
+_CHAR_MAP.update({arabic: str(d) for d, arabic in enumerate("٠١٢٣٤٥٦٧٨٩")})
+_NORMALIZE = str.maketrans(_CHAR_MAP)
+_COLLATE = str.maketrans({letter: chr(0xE000 + rank) for rank, letter in enumerate(_PERSIAN_ALPHABET)})
+
+
+def _normalize(value):
+    return " ".join(str(value).translate(_NORMALIZE).lower().split())
+
+
+def fill_text_keys(apps, schema_editor):
+    Model = apps.get_model('assessment', 'CognitiveTest')
+    rows = list(Model.objects.only('id', 'title', 'description'))
+    for row in rows:
+        row.search_key = "\n".join(_normalize(value) for value in (row.title, row.description))
+        row.sort_key = _normalize(row.title).translate(_COLLATE)[:255]
+    Model.objects.bulk_update(rows, ['search_key', 'sort_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cognitivetest',
+            name='search_key',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cognitivetest',
+            name='sort_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_text_keys, migrations.RunPython.noop),
+    ]
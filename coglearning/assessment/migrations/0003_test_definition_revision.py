@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:48
+
+import assessment.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0002_text_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cognitivetest',
+            name='definition_revision',
+            field=models.CharField(default=assessment.models.new_definition_revision, editable=False, max_length=32),
+        ),
+    ]
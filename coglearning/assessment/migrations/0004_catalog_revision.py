@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0003_test_definition_revision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogRevision',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.CharField(default='', max_length=32)),
+            ],
+        ),
+    ]
@@ -1,6 +1,13 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
 
+
+def new_definition_revision():
+    return uuid.uuid4().hex
+
+
 class CognitiveTest(models.Model):
     TEST_TYPES = (
         ('placement', 'تعیین سطح اولیه'),
@@ -38,6 +45,14 @@ class CognitiveTest(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # کلیدهای نرمال‌شده (ی/ک، نیم‌فاصله، ارقام) — هنگام ذخیره محاسبه می‌شوند
+    search_key = models.TextField(blank=True, editable=False)
+    sort_key = models.CharField(max_length=255, blank=True, editable=False, db_index=True)
+
+    # نسخه تعریف آزمون (خود آزمون، سؤال‌ها و گزینه‌ها)؛ با هر تغییر عوض می‌شود و
+    # چون در دیتابیس است همه پردازه‌ها اسنپ‌شات و کلید پاسخ قدیمی را کنار می‌گذارند
+    definition_revision = models.CharField(max_length=32, default=new_definition_revision, editable=False)
+
     def __str__(self):
         return f"{self.title} ({self.get_test_type_display()})"
 
@@ -101,3 +116,14 @@ class Answer(models.Model):
     is_reviewed = models.BooleanField(default=False)
     time_spent_seconds = models.IntegerField(default=0)
 
+
+class CatalogRevision(models.Model):
+    """
+    توکن نسخه کاتالوگ‌های درون‌پردازه‌ای (فهرست آزمون‌ها، ایندکس سطح محتوا).
+    در دیتابیس است تا نوشتن در یک پردازه کش همه پردازه‌ها را باطل کند.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.CharField(max_length=32, default='')
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -0,0 +1,44 @@
+"""نسخه‌های مشترک (دیتابیسی) برای کش‌های درون‌پردازه‌ای کاتالوگ."""
+
+import uuid
+
+# عنوان/توضیح/فیلدهای مرتب‌سازی آزمون‌ها (ایندکس جست‌وجو و snapshot)؛ فقط نوشتن CognitiveTest
+TEST_CATALOG = "test_catalog"
+# questions_count (کاتالوگ ستونی و کش پاسخ)؛ نوشتن Question
+TEST_QUESTIONS = "test_questions"
+
+
+def current_revision(name):
+    """توکن نسخه فعلی (رشته خالی تا اولین نوشتن)؛ یک SELECT روی کلید اصلی."""
+    return current_revisions(name)[0]
+
+
+def current_revisions(*names):
+    """توکن چند نسخه با یک SELECT، به ترتیب ``names``."""
+    from .models import CatalogRevision
+
+    values = dict(CatalogRevision.objects.filter(name__in=names).values_list("name", "value"))
+    return tuple(values.get(name, "") for name in names)
+
+
+def bump_revision(name, expected=None):
+    """
+    توکن تصادفی تازه در تراکنش جاری؛ بعد از commit همه پردازه‌ها کش قبلی را کنار می‌گذارند.
+    توکن (نه شمارنده) است تا نسخه‌ای که rollback شده هرگز با نسخه بعدی یکی نشود.
+
+    خروجی ``(token, swapped)``: با ``expected`` ابتدا compare-and-swap انجام می‌شود و
+    ``swapped`` یعنی توکن قبلی همان ``expected`` بود، پس کش محلی ساخته‌شده با آن
+    می‌تواند درجا به‌روز شود و توکن تازه را بپذیرد.
+    """
+    from .models import CatalogRevision
+
+    token = uuid.uuid4().hex
+    revisions = CatalogRevision.objects.filter(name=name)
+    if expected and revisions.filter(value=expected).update(value=token):
+        return token, True
+    if revisions.update(value=token):
+        return token, False
+    _, created = CatalogRevision.objects.get_or_create(name=name, defaults={"value": token})
+    if not created:
+        revisions.update(value=token)
+    return token, False
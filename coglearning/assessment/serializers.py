@@ -32,26 +32,33 @@ class QuestionCreateSerializer(serializers.ModelSerializer):
             Choice.objects.create(question=question, **choice_data)
         return question
 
+def questions_count(test):
+    """تعداد سؤال‌ها؛ از annotate لیست‌ها استفاده می‌کند و فقط در نبود آن کوئری می‌زند"""
+    count = getattr(test, 'questions_count', None)
+    if count is None:
+        count = test.questions.count()
+    return count
+
 class CognitiveTestSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     questions_count = serializers.SerializerMethodField()
     class Meta:
         model = CognitiveTest
-        fields = '__all__'
+        exclude = ['search_key', 'sort_key', 'definition_revision']
         read_only_fields = ['created_by']
 
     def get_questions_count(self, obj):
-        return obj.questions.count()
+        return questions_count(obj)
 
 class CognitiveTestDetailSerializer(serializers.ModelSerializer):
     questions = QuestionSerializer(many=True, read_only=True)
     questions_count = serializers.SerializerMethodField()
     class Meta:
         model = CognitiveTest
-        fields = '__all__'
+        exclude = ['search_key', 'sort_key', 'definition_revision']
 
     def get_questions_count(self, obj):
-        return obj.questions.count()
+        return questions_count(obj)
 
 class CognitiveTestCreateSerializer(serializers.ModelSerializer):
     questions = QuestionCreateSerializer(many=True, write_only=True, required=False, default=list)
@@ -97,6 +104,13 @@ class AnswerSerializer(serializers.ModelSerializer):
         model = Answer
         fields = '__all__'
 
+class AnswerBatchItemSerializer(serializers.Serializer):
+    """یک پاسخ در ارسال گروهی پاسخ‌ها"""
+    question = serializers.IntegerField()
+    selected_choice = serializers.IntegerField(required=False, allow_null=True)
+    text_answer = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    time_spent_seconds = serializers.IntegerField(required=False, default=0, min_value=0)
+
 class TestSessionSerializer(serializers.ModelSerializer):
     test_title = serializers.CharField(source='test.title', read_only=True)
     user_full_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -3,42 +3,55 @@ from django.db import transaction
 from accounts.services import AccountService
 from analytics.models import UserPerformanceSummary
 from adaptive_learning.models import UserContentProgress
+from .definitions import get_answer_key
+from .models import Answer, TestSession
 
 class AssessmentService:
 
     @staticmethod
     def calculate_auto_score(session):
-        """محاسبه نمره سوالات تستی و ذخیره نمره هر پاسخ"""
-        all_questions = session.test.questions.all()
-        total_points = sum(q.points for q in all_questions)
-        
+        """محاسبه نمره سوالات تستی و ذخیره نمره هر پاسخ (کلید پاسخ کش‌شده و یک bulk_update)"""
+        key = get_answer_key(session.test)
+        total_points = sum(points for _, _, points, _ in key.values())
+
         if total_points == 0:
             return 0
 
         earned = 0
-        # استفاده از select_related برای بهینه‌سازی کوئری در حلقه
-        for ans in session.answers.select_related('question', 'selected_choice').all():
-            if ans.question.question_type == 'mcq' and ans.selected_choice:
-                if ans.selected_choice.is_correct:
-                    ans.score_earned = ans.question.points
-                    earned += ans.score_earned
-                else:
-                    ans.score_earned = 0
-                
-                ans.is_reviewed = True
-                ans.save()
-        
+        scored = []
+        for ans in Answer.objects.filter(session_id=session.id).only('id', 'question_id', 'selected_choice_id'):
+            entry = key.get(ans.question_id)
+            if entry is None or entry[1] != 'mcq' or not ans.selected_choice_id:
+                continue
+            ans.score_earned = entry[2] if ans.selected_choice_id in entry[3] else 0
+            ans.is_reviewed = True
+            earned += ans.score_earned
+            scored.append(ans)
+        Answer.objects.bulk_update(scored, ['score_earned', 'is_reviewed'])
+
         return (earned / total_points * 100)
 
     @classmethod
     def process_test_completion(cls, session):
-        """مدیریت پایان آزمون و ارجاع به تصحیح یا اتمام قطعی"""
+        """
+        مدیریت پایان آزمون و ارجاع به تصحیح یا اتمام قطعی.
+        فقط یک بار اجرا می‌شود؛ درخواست‌های تکراری/هم‌زمان نتیجه ذخیره‌شده را می‌گیرند.
+        """
         with transaction.atomic():
+            finished_at = timezone.now()
+            # ادعای اتمی جلسه: فقط اولین درخواست ردیف in_progress را تغییر می‌دهد و قفل می‌کند
+            claimed = TestSession.objects.filter(
+                pk=session.pk, status='in_progress', finished_at__isnull=True
+            ).update(finished_at=finished_at)
+            if not claimed:
+                session.refresh_from_db(fields=['status', 'total_score', 'finished_at'])
+                return session
+
             test = session.test
             has_essay = test.questions.filter(question_type='text').exists()
             
             session.total_score = cls.calculate_auto_score(session)
-            session.finished_at = timezone.now()
+            session.finished_at = finished_at
 
             if has_essay:
                 session.status = 'pending_review'
@@ -57,24 +70,39 @@ class AssessmentService:
                 session.user.save(update_fields=['has_taken_placement_test'])
 
             session.save()
+        return session
 
     @staticmethod
-    def update_analytics_profile(session):
+    def aggregate_session_scores(session):
+        """
+        جمع نمره کسب‌شده و نمره ممکن هر دسته در یک پیمایش روی پاسخ‌ها:
+        {category: (earned, possible)} — دسته و امتیاز سؤال از کلید پاسخ کش‌شده
+        """
+        key = get_answer_key(session.test)
+        totals = {}
+        for question_id, score in Answer.objects.filter(session_id=session.id).values_list(
+            'question_id', 'score_earned'
+        ):
+            entry = key.get(question_id)
+            if entry is None:
+                continue
+            earned, possible = totals.get(entry[0], (0, 0))
+            totals[entry[0]] = (earned + score, possible + entry[2])
+        return totals
+
+    @classmethod
+    def update_analytics_profile(cls, session, category_totals=None):
         """تفکیک نمرات بر اساس دسته‌بندی سوالات و بروزرسانی میانگین‌ها"""
         user = session.user
         summary, _ = UserPerformanceSummary.objects.get_or_create(user=user)
         count = summary.total_tests_completed
-        
-        # دسته‌بندی پاسخ‌ها بر اساس نوع سوال
-        categories = ['memory', 'focus', 'logic']
-        answers = session.answers.select_related('question').all()
 
-        for cat in categories:
-            cat_answers = [a for a in answers if a.question.category == cat]
-            
-            if cat_answers:
-                cat_earned = sum(a.score_earned for a in cat_answers)
-                cat_total = sum(a.question.points for a in cat_answers)
+        if category_totals is None:
+            category_totals = cls.aggregate_session_scores(session)
+
+        for cat in ['memory', 'focus', 'logic']:
+            if cat in category_totals:
+                cat_earned, cat_total = category_totals[cat]
                 cat_score = (cat_earned / cat_total * 100) if cat_total > 0 else 0
                 
                 # فرمول میانگین متحرک (Moving Average)
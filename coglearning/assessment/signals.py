@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from .catalog_bridge import index_test, invalidate_question_counts, text_keys, unindex_test
+from .definitions import bump_test_definition
+from .models import Choice, CognitiveTest, Question, new_definition_revision
+
+
+@receiver(pre_save, sender=CognitiveTest)
+def fill_test_text_keys(sender, instance, **kwargs):
+    instance.search_key, instance.sort_key = text_keys(instance.title, instance.description)
+    # فیلدهای خود آزمون هم بخشی از تعریف سریال‌شده‌اند؛ نسخه در همان UPDATE ذخیره می‌شود
+    instance.definition_revision = new_definition_revision()
+
+
+@receiver(post_save, sender=CognitiveTest)
+def reindex_test(sender, instance, **kwargs):
+    index_test(instance)
+
+
+@receiver(post_delete, sender=CognitiveTest)
+def drop_test_from_index(sender, instance, **kwargs):
+    unindex_test(instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def drop_cached_catalog(sender, instance, **kwargs):
+    # فقط questions_count (پاسخ‌های کش‌شده و کاتالوگ ستونی) تغییر کرده است؛ ایندکس و snapshot می‌مانند
+    invalidate_question_counts()
+    # تعریف آزمون و کلید پاسخ هم نسخه جدید می‌گیرند
+    bump_test_definition(instance.test_id)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def bump_definition_on_choice_write(sender, instance, **kwargs):
+    CognitiveTest.objects.filter(questions__id=instance.question_id).update(
+        definition_revision=new_definition_revision()
+    )
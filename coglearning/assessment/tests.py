@@ -1,11 +1,19 @@
-from django.test import TestCase
+from django.core.cache import cache
+import threading
+import time
+
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from accounts.models import User
-from assessment.models import CognitiveTest, TestSession
+from analytics.models import UserPerformanceSummary
+from assessment.models import Answer, CognitiveTest, Question, TestSession
+from assessment.services import AssessmentService
 
 
 class ResultOwnershipTests(TestCase):
@@ -96,6 +104,17 @@ class IsTeacherPermissionTests(TestCase):
         self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
 
 
+    def test_teacher_list_counts_questions_without_n_plus_one(self):
+        for i in range(3):
+            test = CognitiveTest.objects.create(title=f'T{i}', created_by=self.teacher)
+            for j in range(i):
+                Question.objects.create(test=test, text=f'Q{j}', category='logic', question_type='text', order=j)
+        self.client.force_authenticate(user=self.teacher)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/assessment/teacher/tests/all/')
+        self.assertEqual([r['questions_count'] for r in response.data], [2, 1, 0])
+
+
 class CatalogIntegrationTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -126,5 +145,460 @@ class CatalogIntegrationTests(TestCase):
         self.assertIn('results', response.data)
         self.assertIn('catalog_meta', response.data)
         self.assertEqual(response.data['catalog_meta']['sort_algorithm'], 'merge')
+        self.assertTrue(response.data['catalog_meta']['streamed'])
+        self.assertEqual(response.data['catalog_meta']['total_before'], 2)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['title'], 'Alpha Memory')
+
+    def test_index_search_tracks_test_writes(self):
+        self.client.force_authenticate(user=self.student)
+        url = '/api/assessment/tests/'
+        response = self.client.get(url, {'search_algo': 'index', 'q': 'logic'})
+        self.assertEqual(response.data['catalog_meta']['search_algorithm'], 'index')
+        self.assertEqual([r['title'] for r in response.data['results']], ['Beta Logic'])
+
+        renamed = CognitiveTest.objects.get(title='Alpha Memory')
+        renamed.title = 'Alpha Logic'
+        renamed.save()
+        response = self.client.get(url, {'search_algo': 'index', 'q': 'logic'})
+        self.assertEqual(
+            [r['title'] for r in response.data['results']], ['Alpha Logic', 'Beta Logic']
+        )
+
+        renamed.delete()
+        response = self.client.get(url, {'search_algo': 'index', 'q': 'logic'})
+        self.assertEqual([r['title'] for r in response.data['results']], ['Beta Logic'])
+
+    def test_binary_prefix_search(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(
+            '/api/assessment/tests/', {'search_algo': 'binary', 'q': 'alp', 'prefix': 'true'}
+        )
+        self.assertTrue(response.data['catalog_meta']['prefix'])
+        self.assertEqual([r['title'] for r in response.data['results']], ['Alpha Memory'])
+
+    def test_sort_reads_snapshot_and_tracks_writes(self):
+        self.client.force_authenticate(user=self.student)
+        url = '/api/assessment/tests/'
+        first = self.client.get(url, {'sort_field': 'title', 'reverse': 'true'})
+        self.assertIsNotNone(first.data['catalog_meta']['snapshot_version'])
+        self.assertEqual([r['title'] for r in first.data['results']], ['Beta Logic', 'Alpha Memory'])
+
+        CognitiveTest.objects.create(title='Gamma Focus', test_type='general', min_level=1)
+        second = self.client.get(url, {'sort_field': 'title', 'reverse': 'true'})
+        self.assertNotEqual(
+            second.data['catalog_meta']['snapshot_version'],
+            first.data['catalog_meta']['snapshot_version'],
+        )
+        self.assertEqual(
+            [r['title'] for r in second.data['results']],
+            ['Gamma Focus', 'Beta Logic', 'Alpha Memory'],
+        )
+
+    def test_sort_algorithm_defaults_to_user_preference(self):
+        self.student.preferred_sort_algorithm = 'merge_iter'
+        self.student.save(update_fields=['preferred_sort_algorithm'])
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/api/assessment/tests/')
+        self.assertEqual(response.data['catalog_meta']['sort_algorithm'], 'merge_iter')
+
+        response = self.client.get('/api/assessment/tests/', {'sort_algo': 'bubble'})
+        self.assertEqual(response.data['catalog_meta']['sort_algorithm'], 'bubble')
+
+    def test_limit_offset_returns_one_page(self):
+        CognitiveTest.objects.create(title='Gamma Focus', test_type='general', min_level=1)
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/api/assessment/tests/', {'limit': 1, 'offset': 1})
+        meta = response.data['catalog_meta']
+        self.assertTrue(meta['partial_sort'])
+        # the page comes from the bounded streaming heap, not a snapshot walk
+        self.assertTrue(meta['streamed'])
+        self.assertIsNone(meta['snapshot_version'])
+        self.assertEqual(meta['total_matched'], 3)
+        self.assertEqual([r['title'] for r in response.data['results']], ['Beta Logic'])
+
+    def test_pages_over_tied_levels_follow_id_order(self):
+        from assessment.catalog_bridge import invalidate_catalog_responses
+
+        for title in ('Gamma Focus', 'Delta Recall', 'Epsilon Span'):
+            CognitiveTest.objects.create(title=title, test_type='general', min_level=1)
+        expected = list(
+            CognitiveTest.objects.order_by('id').values_list('title', flat=True)
+        )
+        self.client.force_authenticate(user=self.student)
+        url = '/api/assessment/tests/'
+        # queryset stream/snapshot, then the columnar catalog
+        for min_rows, reverse in ((2000, 'false'), (2000, 'true'), (1, 'false'), (1, 'true')):
+            params = {'sort_field': 'min_level', 'sort_algo': 'merge', 'reverse': reverse}
+            invalidate_catalog_responses()
+            with self.settings(CATALOG_COLUMNAR_MIN_ROWS=min_rows):
+                unpaged = self.client.get(url, params).data
+                self.assertEqual(unpaged['catalog_meta']['columnar'], min_rows == 1)
+                self.assertEqual([r['title'] for r in unpaged['results']], expected)
+                paged = []
+                for offset in range(0, len(expected), 2):
+                    page = self.client.get(url, dict(params, limit=2, offset=offset)).data
+                    paged.extend(r['title'] for r in page['results'])
+            self.assertEqual(paged, expected)
+
+    def test_composite_sort_spec(self):
+        CognitiveTest.objects.create(title='Gamma Focus', test_type='general', min_level=5)
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/api/assessment/tests/', {'sort_field': '-min_level,title'})
+        self.assertEqual(response.data['catalog_meta']['sort_spec'], '-min_level,title')
+        self.assertEqual(
+            [r['title'] for r in response.data['results']],
+            ['Gamma Focus', 'Alpha Memory', 'Beta Logic'],
+        )
+
+    def test_persian_text_keys_are_stored_and_searched(self):
+        test = CognitiveTest.objects.create(title='آزمون علمی', description='كتاب', min_level=1)
+        self.assertEqual(test.search_key, 'آزمون علمی\nکتاب')
+        self.assertTrue(test.sort_key)
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/api/assessment/tests/', {'q': 'علمي'})
+        self.assertEqual([r['title'] for r in response.data['results']], ['آزمون علمی'])
+        self.assertNotIn('search_key', response.data['results'][0])
+        response = self.client.get('/api/assessment/tests/', {'q': 'کتاب'})
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_catalog_response_is_cached_until_questions_change(self):
+        self.client.force_authenticate(user=self.student)
+        url = '/api/assessment/tests/'
+        first = self.client.get(url, {'q': 'Alpha ', 'sort_algo': 'merge'})
+        with self.assertNumQueries(1):  # catalog revision only
+            second = self.client.get(url, {'q': 'alpha', 'sort_algo': 'merge'})
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(first.data['results'][0]['questions_count'], 0)
+
+        test = CognitiveTest.objects.get(title='Alpha Memory')
+        Question.objects.create(test=test, text='Q1', category='memory', question_type='text')
+        third = self.client.get(url, {'q': 'alpha', 'sort_algo': 'merge'})
+        self.assertEqual(third.data['results'][0]['questions_count'], 1)
+
+    def test_question_writes_keep_index_and_snapshot(self):
+        from assessment.catalog_bridge import catalog_version, get_catalog_index, get_catalog_snapshot
+
+        before = catalog_version()
+        index, snapshot = get_catalog_index(before), get_catalog_snapshot(before)
+        test = CognitiveTest.objects.get(title='Alpha Memory')
+        Question.objects.create(test=test, text='Q1', category='memory', question_type='text')
+        after = catalog_version()
+        self.assertEqual(after.tests, before.tests)
+        self.assertNotEqual(after.questions, before.questions)
+        self.assertIs(get_catalog_index(after), index)
+        self.assertIs(get_catalog_snapshot(after), snapshot)
+
+    def test_test_writes_update_the_local_index_in_place(self):
+        from assessment.catalog_bridge import get_catalog_index
+
+        index = get_catalog_index()
+        test = CognitiveTest.objects.create(title='Gamma Recall', min_level=1)
+        with self.assertNumQueries(1):  # revisions only, no rebuild
+            self.assertIs(get_catalog_index(), index)
+        self.assertIn(test.id, index.search('recall'))
+
+        test_id = test.id
+        test.delete()
+        self.assertIs(get_catalog_index(), index)
+        self.assertNotIn(test_id, index.search('recall'))
+
+    @override_settings(CATALOG_COLUMNAR_MIN_ROWS=1)
+    def test_columnar_catalog_applies_level_rules(self):
+        CognitiveTest.objects.create(title='Gamma Focus', test_type='general', min_level=50)
+        CognitiveTest.objects.create(title='Delta Placement', test_type='placement', min_level=1)
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/api/assessment/tests/', {'sort_field': '-title'})
+        self.assertTrue(response.data['catalog_meta']['columnar'])
+        self.assertEqual([r['title'] for r in response.data['results']], ['Beta Logic', 'Alpha Memory'])
+
+        self.student.has_taken_placement_test = False
+        self.student.save()
+        response = self.client.get('/api/assessment/tests/')
+        self.assertEqual([r['title'] for r in response.data['results']], ['Delta Placement'])
+
+    @override_settings(CATALOG_COLUMNAR_MIN_ROWS=1)
+    def test_caches_follow_revision_bumped_by_another_process(self):
+        from assessment.revisions import TEST_CATALOG, bump_revision
+
+        self.client.force_authenticate(user=self.student)
+        url = '/api/assessment/tests/'
+        for params in ({}, {'search_algo': 'index', 'q': 'a'}):
+            self.client.get(url, params)
+        # نوشتن در پردازه دیگر: بدون سیگنال محلی، فقط نسخه دیتابیس عوض می‌شود
+        CognitiveTest.objects.filter(title='Beta Logic').update(is_active=False, title='Beta Hidden')
+        CognitiveTest.objects.bulk_create([CognitiveTest(title='Gamma Area', min_level=1)])
+        bump_revision(TEST_CATALOG)
+
+        listed = self.client.get(url).data
+        self.assertTrue(listed['catalog_meta']['columnar'])
+        self.assertEqual([r['title'] for r in listed['results']], ['Alpha Memory', 'Gamma Area'])
+        searched = self.client.get(url, {'search_algo': 'index', 'q': 'area'}).data
+        self.assertEqual([r['title'] for r in searched['results']], ['Gamma Area'])
+
+
+class TestDefinitionSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='def_teacher', password='StrongPass123!', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='def_stu', password='StrongPass123!', role='student',
+            cognitive_level=10, has_taken_placement_test=True,
+        )
+        self.test = CognitiveTest.objects.create(title='Snapshot', created_by=self.teacher, min_level=1)
+        question = Question.objects.create(
+            test=self.test, text='Q1', category='memory', question_type='mcq', order=1
+        )
+        question.choices.create(text='A', is_correct=True, order=1)
+        question.choices.create(text='B', is_correct=False, order=2)
+        self.url = f'/api/assessment/tests/{self.test.id}/'
+
+    def test_detail_is_served_from_cache_and_bumped_by_question_edits(self):
+        self.client.force_authenticate(user=self.student)
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first.json()['questions'][0]['choices']), 2)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+
+        # نسخه در دیتابیس عوض می‌شود، پس هر پردازه‌ای (نه فقط نویسنده) اسنپ‌شات تازه می‌سازد
+        revision = self.test.definition_revision
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.post(
+            f'/api/assessment/teacher/tests/{self.test.id}/questions/',
+            {'category': 'logic', 'question_type': 'text', 'text': 'Q2', 'order': 2},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.test.refresh_from_db()
+        self.assertNotEqual(self.test.definition_revision, revision)
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(len(self.client.get(self.url).json()['questions']), 2)
+
+        self.client.force_authenticate(user=self.teacher)
+        self.client.delete(f"/api/assessment/teacher/questions/{response.data['id']}/delete/")
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual([q['text'] for q in self.client.get(self.url).json()['questions']], ['Q1'])
+
+
+class BatchAnswerTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.student = User.objects.create_user(
+            username='batch_stu', password='StrongPass123!', role='student'
+        )
+        self.test = CognitiveTest.objects.create(title='Batch', test_type='general')
+        self.questions = [
+            Question.objects.create(test=self.test, text=f'Q{i}', question_type='mcq', order=i)
+            for i in range(3)
+        ]
+        self.choices = [q.choices.create(text='A', is_correct=True) for q in self.questions]
+        self.session = TestSession.objects.create(
+            user=self.student, test=self.test, expires_at=timezone.now() + timezone.timedelta(minutes=30)
+        )
+        self.url = f'/api/assessment/sessions/{self.session.id}/answers/'
+        self.client.force_authenticate(user=self.student)
+
+    def test_bulk_upsert_in_constant_queries(self):
+        answers = [
+            {'question': q.id, 'selected_choice': c.id, 'time_spent_seconds': 5}
+            for q, c in zip(self.questions, self.choices)
+        ]
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, {'answers': answers}, format='json')
+        self.assertEqual(response.data, {'status': 'saved', 'created': 3, 'updated': 0})
+
+        answers[0]['selected_choice'] = None
+        answers[0]['text_answer'] = 'changed'
+        response = self.client.post(self.url, answers[:2], format='json')
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(self.session.answers.count(), 3)
+        self.assertEqual(self.session.answers.get(question=self.questions[0]).text_answer, 'changed')
+
+    def test_rejects_batch_for_session_claimed_by_finish(self):
+        # finish_test_session ادعا کرده (finished_at) ولی هنوز وضعیت را عوض نکرده است
+        TestSession.objects.filter(pk=self.session.pk).update(finished_at=timezone.now())
+        response = self.client.post(self.url, {'answers': [
+            {'question': self.questions[0].id, 'selected_choice': self.choices[0].id},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.session.answers.exists())
+
+    def test_rejects_foreign_question_or_choice(self):
+        other = CognitiveTest.objects.create(title='Other')
+        foreign = Question.objects.create(test=other, text='X', order=1)
+        response = self.client.post(self.url, {'answers': [
+            {'question': self.questions[0].id, 'selected_choice': self.choices[1].id},
+            {'question': foreign.id},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['invalid_questions'], [foreign.id])
+        self.assertEqual(response.data['invalid_choices'], [self.questions[0].id])
+        self.assertFalse(self.session.answers.exists())
+
+
+class AutoScoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            username='score_stu', password='StrongPass123!', role='student'
+        )
+
+    def _session(self, n_mcq):
+        test = CognitiveTest.objects.create(title=f'Score {n_mcq}')
+        session = TestSession.objects.create(
+            user=self.student, test=test, expires_at=timezone.now() + timezone.timedelta(minutes=30)
+        )
+        for i in range(n_mcq):
+            question = Question.objects.create(test=test, text=f'Q{i}', points=10, order=i)
+            right = question.choices.create(text='right', is_correct=True)
+            wrong = question.choices.create(text='wrong', is_correct=False)
+            Answer.objects.create(session=session, question=question, selected_choice=right if i % 2 == 0 else wrong)
+        essay = Question.objects.create(test=test, text='E', question_type='text', points=20, order=n_mcq)
+        Answer.objects.create(session=session, question=essay, text_answer='...')
+        return session
+
+    def test_scores_in_memory_with_constant_queries(self):
+        counts = []
+        for n in (2, 6):
+            session = self._session(n)
+            with CaptureQueriesContext(connection) as ctx:
+                score = AssessmentService.calculate_auto_score(session)
+            counts.append(len(ctx.captured_queries))
+            self.assertAlmostEqual(score, (n + 1) // 2 * 10 / (n * 10 + 20) * 100)
+            scored = session.answers.filter(question__question_type='mcq')
+            self.assertTrue(all(a.is_reviewed for a in scored))
+            self.assertEqual(sorted(a.score_earned for a in scored), sorted([10.0] * ((n + 1) // 2) + [0.0] * (n // 2)))
+            self.assertFalse(session.answers.get(question__question_type='text').is_reviewed)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_answer_key_is_cached_and_follows_choice_edits(self):
+        from assessment.definitions import get_answer_key
+
+        session = self._session(2)
+        key = get_answer_key(session.test)
+        with self.assertNumQueries(0):
+            self.assertIs(get_answer_key(session.test), key)
+
+        question = session.test.questions.filter(question_type='mcq').first()
+        for choice in question.choices.all():
+            choice.is_correct = False
+            choice.save()
+        # پردازه دیگری که آزمون را تازه از دیتابیس می‌خواند نسخه جدید را می‌بیند
+        fresh = CognitiveTest.objects.get(pk=session.test_id)
+        self.assertNotEqual(fresh.definition_revision, session.test.definition_revision)
+        self.assertEqual(get_answer_key(fresh)[question.id][3], frozenset())
+
+
+class ManualGradeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='grade_teacher', password='StrongPass123!', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='grade_stu', password='StrongPass123!', role='student',
+            cognitive_level=10, has_taken_placement_test=True,
+        )
+        test = CognitiveTest.objects.create(title='Graded', created_by=self.teacher, passing_score=101)
+        mcq = Question.objects.create(test=test, text='M', category='memory', points=10, order=1)
+        right = mcq.choices.create(text='right', is_correct=True)
+        essay = Question.objects.create(
+            test=test, text='E', category='logic', question_type='text', points=20, order=2
+        )
+        self.session = TestSession.objects.create(
+            user=self.student, test=test, expires_at=timezone.now() + timezone.timedelta(minutes=30)
+        )
+        Answer.objects.create(session=self.session, question=mcq, selected_choice=right)
+        self.essay_answer = Answer.objects.create(session=self.session, question=essay, text_answer='...')
+
+    def test_grade_aggregates_categories_once_for_score_and_analytics(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post(f'/api/assessment/sessions/{self.session.id}/finish/')
+        self.assertEqual(response.data['status'], 'pending_review')
+        self.assertEqual(
+            AssessmentService.aggregate_session_scores(self.session),
+            {'memory': (10.0, 10), 'logic': (0.0, 20)},
+        )
+
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.post(
+            f'/api/assessment/teacher/sessions/{self.session.id}/grade/',
+            {'grades': [{'answer_id': self.essay_answer.id, 'score': 15}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.session.refresh_from_db()
+        self.assertAlmostEqual(self.session.total_score, 25 / 30 * 100)
+        summary = UserPerformanceSummary.objects.get(user=self.student)
+        self.assertEqual((summary.avg_memory_score, summary.avg_logic_score), (100.0, 75.0))
+        self.assertEqual(summary.total_tests_completed, 1)
+
+
+class FinishSessionIdempotencyTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(
+            username='finish_stu', password='StrongPass123!', role='student',
+            cognitive_level=10, has_taken_placement_test=True,
+        )
+        test = CognitiveTest.objects.create(title='Finish', target_level=10, passing_score=50)
+        question = Question.objects.create(test=test, text='Q', category='focus', order=1)
+        right = question.choices.create(text='right', is_correct=True)
+        self.session = TestSession.objects.create(
+            user=self.student, test=test, expires_at=timezone.now() + timezone.timedelta(minutes=30)
+        )
+        Answer.objects.create(session=self.session, question=question, selected_choice=right)
+        self.url = f'/api/assessment/sessions/{self.session.id}/finish/'
+
+    def _assert_processed_once(self):
+        summary = UserPerformanceSummary.objects.get(user=self.student)
+        self.assertEqual(summary.total_tests_completed, 1)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.cognitive_level, 15)
+
+    def test_stale_second_call_returns_stored_result(self):
+        first = TestSession.objects.get(pk=self.session.pk)
+        stale = TestSession.objects.get(pk=self.session.pk)
+        AssessmentService.process_test_completion(first)
+        with self.assertNumQueries(4):  # BEGIN, conditional UPDATE, refresh, COMMIT
+            result = AssessmentService.process_test_completion(stale)
+        self.assertEqual((result.status, result.total_score), ('completed', 100.0))
+        self._assert_processed_once()
+
+    def test_concurrent_finishers(self):
+        barrier = threading.Barrier(8)
+        responses = []
+
+        def finish():
+            client = APIClient()
+            client.force_authenticate(user=self.student)
+            barrier.wait()
+            try:
+                # SQLite's shared in-memory test DB raises "table is locked" instead
+                # of waiting, so behave like a retrying client
+                for _ in range(200):
+                    try:
+                        responses.append(client.post(self.url))
+                        break
+                    except OperationalError:
+                        time.sleep(0.01)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=finish) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(responses), 8)
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'status': 'completed', 'score': 100.0})
+        self._assert_processed_once()
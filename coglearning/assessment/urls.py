@@ -15,6 +15,7 @@ urlpatterns = [
     path("tests/<int:test_id>/start/", start_test_session),#tested
     path("tests/<int:test_id>/", get_test_detail),
     path("sessions/<int:session_id>/questions/<int:question_id>/answer/", submit_answer),#tested
+    path("sessions/<int:session_id>/answers/", submit_answers_batch),
     path("sessions/<int:session_id>/finish/", finish_test_session),#tested
     path("tests/", StudentTestListView.as_view()),#tested
     path("teacher/reviews/pending/", PendingReviewsListView.as_view()),#tested
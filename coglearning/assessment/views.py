@@ -1,3 +1,4 @@
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction, models
@@ -8,6 +9,7 @@ from rest_framework.response import Response
 from .models import CognitiveTest, Question, Choice, TestSession, Answer
 from .serializers import *
 from .services import AssessmentService
+from .definitions import get_test_definition
 from accounts.permissions import IsTeacher
 
 # --- Teacher: Test Management ---
@@ -16,11 +18,13 @@ class TeacherTestListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacher]
     def get_queryset(self):
         user = self.request.user
+        count = models.Count('questions', distinct=True)
+        base = CognitiveTest.objects.select_related('created_by')
         if user.role == 'admin':
-            return CognitiveTest.objects.all().order_by("-id")
-        return CognitiveTest.objects.filter(
+            return base.annotate(questions_count=count).order_by("-id")
+        return base.filter(
             models.Q(created_by=user) | models.Q(related_content__author=user)
-        ).distinct().order_by("-id")
+        ).annotate(questions_count=count).distinct().order_by("-id")
 
 class CognitiveTestCreateView(generics.CreateAPIView):
     serializer_class = CognitiveTestCreateSerializer
@@ -148,10 +152,65 @@ def submit_answer(request, session_id, question_id):
     })
     return Response({"status": "saved"})
 
+@api_view(["POST"])
+def submit_answers_batch(request, session_id):
+    """ثبت گروهی پاسخ‌ها: اعتبارسنجی با یک کوئری و upsert گروهی در یک تراکنش"""
+    session = get_object_or_404(TestSession, id=session_id, user=request.user)
+    if session.status != 'in_progress':
+        return Response({"error": "جلسه آزمون بسته شده است"}, status=400)
+    payload = request.data.get("answers", []) if isinstance(request.data, dict) else request.data
+    serializer = AnswerBatchItemSerializer(data=payload, many=True)
+    serializer.is_valid(raise_exception=True)
+    # در صورت تکرار یک سؤال، آخرین پاسخ معتبر است
+    items = {item['question']: item for item in serializer.validated_data}
+
+    # سؤال‌های همین آزمون و گزینه‌هایشان در یک کوئری
+    choices_by_question = {}
+    for question_id, choice_id in Question.objects.filter(
+        test_id=session.test_id, id__in=items
+    ).values_list('id', 'choices__id'):
+        choices_by_question.setdefault(question_id, set()).add(choice_id)
+
+    invalid_questions = sorted(set(items) - set(choices_by_question))
+    invalid_choices = sorted(
+        item['question'] for item in items.values()
+        if item.get('selected_choice') is not None
+        and item['question'] in choices_by_question
+        and item['selected_choice'] not in choices_by_question[item['question']]
+    )
+    if invalid_questions or invalid_choices:
+        return Response({
+            "error": "سؤال یا گزینه نامعتبر",
+            "invalid_questions": invalid_questions,
+            "invalid_choices": invalid_choices,
+        }, status=400)
+
+    with transaction.atomic():
+        # قفل جلسه و بررسی دوباره وضعیت: finish_test_session ممکن است هم‌زمان جلسه را بسته باشد
+        open_session = TestSession.objects.select_for_update().filter(
+            pk=session.pk, status='in_progress', finished_at__isnull=True
+        ).values_list('pk', flat=True).first()
+        if open_session is None:
+            return Response({"error": "جلسه آزمون بسته شده است"}, status=400)
+        existing = {
+            a.question_id: a
+            for a in Answer.objects.select_for_update().filter(session=session, question_id__in=items)
+        }
+        to_create, to_update = [], []
+        for question_id, item in items.items():
+            answer = existing.get(question_id) or Answer(session=session, question_id=question_id)
+            answer.selected_choice_id = item.get('selected_choice')
+            answer.text_answer = item.get('text_answer')
+            answer.time_spent_seconds = item.get('time_spent_seconds', 0)
+            (to_update if answer.pk else to_create).append(answer)
+        Answer.objects.bulk_create(to_create)
+        Answer.objects.bulk_update(to_update, ['selected_choice', 'text_answer', 'time_spent_seconds'])
+    return Response({"status": "saved", "created": len(to_create), "updated": len(to_update)})
+
 @api_view(["POST"])
 def finish_test_session(request, session_id):
     session = get_object_or_404(TestSession, id=session_id, user=request.user)
-    AssessmentService.process_test_completion(session)
+    session = AssessmentService.process_test_completion(session)
     return Response({"status": session.status, "score": session.total_score})
 
 class StudentTestListView(generics.ListAPIView):
@@ -161,9 +220,10 @@ class StudentTestListView(generics.ListAPIView):
     def get_queryset(self):
         user = self.request.user
         level = user.cognitive_level or 1
+        # مرتب‌سازی‌ها پایدارند؛ ترتیب ثابت id تساوی‌ها را بین صفحه‌ها یکسان نگه می‌دارد
         base = CognitiveTest.objects.filter(is_active=True).select_related(
             'created_by', 'related_content'
-        )
+        ).annotate(questions_count=models.Count('questions')).order_by('id')
         if user.role != 'student':
             return base
         if not user.has_taken_placement_test:
@@ -171,13 +231,27 @@ class StudentTestListView(generics.ListAPIView):
         return base.filter(min_level__lte=level).exclude(test_type='placement')
 
     def list(self, request, *args, **kwargs):
-        from .catalog_bridge import apply_catalog
+        from .catalog_bridge import (
+            apply_catalog, catalog_cache_key, catalog_version, columnar_tests_for, get_response_cache,
+        )
+
+        # one read of the shared catalog revisions per request
+        version = catalog_version()
+        cache = get_response_cache()
+        cache_key = catalog_cache_key(request, version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
 
-        queryset = self.filter_queryset(self.get_queryset())
-        items = list(queryset)
-        processed, meta = apply_catalog(items, request)
+        items = columnar_tests_for(request.user, version)
+        if items is None:
+            # consumed lazily by process_catalog; only matches are materialized
+            items = self.filter_queryset(self.get_queryset()).iterator(chunk_size=500)
+        processed, meta = apply_catalog(items, request, version)
         serializer = self.get_serializer(processed, many=True)
-        return Response({"results": serializer.data, "catalog_meta": meta})
+        data = {"results": serializer.data, "catalog_meta": meta}
+        cache.set(cache_key, data)
+        return Response(data)
 
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
@@ -192,8 +266,7 @@ def get_test_detail(request, test_id):
             return Response({"error": "عدم دسترسی"}, status=403)
         if test.test_type != 'placement' and test.min_level and user_level < test.min_level:
             return Response({"error": "عدم دسترسی"}, status=403)
-    serializer = CognitiveTestDetailSerializer(test)
-    return Response(serializer.data)
+    return HttpResponse(get_test_definition(test), content_type='application/json')
 
 # --- Review & Results ---
 class PendingReviewsListView(generics.ListAPIView):
@@ -244,14 +317,15 @@ def submit_manual_grade(request, session_id):
         grades = request.data.get("grades", [])
         for g in grades:
             Answer.objects.filter(id=g['answer_id'], session=session).update(score_earned=g['score'], is_reviewed=True)
-        # محاسبه مجدد نمره کل
-        total = sum(a.score_earned for a in session.answers.all())
-        possible = sum(a.question.points for a in session.answers.all())
+        # محاسبه مجدد نمره کل (یک پیمایش، مشترک با بروزرسانی آنالیتیکس)
+        category_totals = AssessmentService.aggregate_session_scores(session)
+        total = sum(earned for earned, _ in category_totals.values())
+        possible = sum(points for _, points in category_totals.values())
         session.total_score = (total/possible*100) if possible > 0 else 0
         session.status = 'completed'
         session.save()
         AssessmentService.apply_level_logic(session.user, session)
-        AssessmentService.update_analytics_profile(session)
+        AssessmentService.update_analytics_profile(session, category_totals)
         AssessmentService.mark_content_completed_if_content_based(session)
     return Response({"status": "graded"})
 
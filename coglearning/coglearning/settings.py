@@ -120,6 +120,17 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# Above this many active tests, the student catalog is served from a cached
+# NumPy columnar catalog (vectorized level filter + argsort) when numpy is installed.
+CATALOG_COLUMNAR_MIN_ROWS = int(os.getenv('CATALOG_COLUMNAR_MIN_ROWS', '2000'))
+
+# In-process LRU/TTL cache of student catalog responses (cleared on test/question writes).
+CATALOG_CACHE_SIZE = int(os.getenv('CATALOG_CACHE_SIZE', '256'))
+CATALOG_CACHE_TTL = int(os.getenv('CATALOG_CACHE_TTL', '60'))
+
+# Number of items in a generated learning path (adaptive_learning)
+LEARNING_PATH_LENGTH = int(os.getenv('LEARNING_PATH_LENGTH', '5'))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
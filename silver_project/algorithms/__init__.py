@@ -1,13 +1,41 @@
-from .sorting import bubble_sort, merge_sort
-from .searching import linear_search, binary_search
+from .sorting import (
+    bubble_sort,
+    compile_sort_key,
+    merge_sort,
+    merge_sort_iterative,
+    parse_sort_spec,
+    partial_sort,
+)
+from .searching import (
+    linear_search,
+    binary_search,
+    binary_search_range,
+    lower_bound,
+    upper_bound,
+)
+from .indexing import CatalogIndex
 from .utils import get_item_value
 from .catalog import process_catalog
+from .snapshots import CatalogSnapshot
+from .columnar import ColumnarCatalog
+from .levels import LevelIndex
 
 __all__ = [
     "bubble_sort",
     "merge_sort",
+    "merge_sort_iterative",
+    "partial_sort",
+    "parse_sort_spec",
+    "compile_sort_key",
     "linear_search",
     "binary_search",
+    "binary_search_range",
+    "lower_bound",
+    "upper_bound",
+    "CatalogIndex",
     "process_catalog",
+    "CatalogSnapshot",
+    "ColumnarCatalog",
+    "LevelIndex",
     "get_item_value",
 ]
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark.py — scaling curves for the catalog algorithms
+
+Times every entry of SORT_ALGORITHMS and SEARCH_ALGORITHMS, plus
+process_catalog end to end, on synthetic catalogs shaped like
+demo.SAMPLE_CATALOG. Each row also carries an operation count
+(key comparisons for sorts, field reads for searches) so runs on
+different machines can still be compared.
+
+Results are written as JSON and CSV with a fixed row order, so two
+runs (e.g. before/after a commit) can be diffed directly.
+
+Usage:
+    cd silver_project
+    python -m algorithms.benchmark                       # 1k / 10k / 100k
+    python -m algorithms.benchmark --sizes 500 2000 --repeat 5
+    python -m algorithms.benchmark --out bench/ --bubble-max 2000
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+_pkg_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _pkg_root not in sys.path:
+    sys.path.insert(0, _pkg_root)
+
+from algorithms.catalog import (  # noqa: E402
+    SEARCH_ALGORITHMS,
+    SORT_ALGORITHMS,
+    process_catalog,
+)
+from algorithms.indexing import CatalogIndex  # noqa: E402
+from algorithms.searching import binary_search_range, linear_search, normalized_key  # noqa: E402
+from algorithms.snapshots import CatalogSnapshot  # noqa: E402
+from algorithms.sorting import merge_sort  # noqa: E402
+from algorithms.utils import get_item_value  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Bubble sort is O(n²): above this size a single run takes minutes.
+DEFAULT_BUBBLE_MAX = 5000
+SORT_FIELDS = ("title", "min_level", "time_limit_minutes")
+QUERIES = ("memory", "Logic Test 1", "reasoning", "zzz-not-found")
+FIELDNAMES = ("suite", "algorithm", "size", "field", "seconds", "operations", "matches", "skipped")
+
+_TOPICS = (
+    ("Memory", "Measures short-term and working memory"),
+    ("Attention", "Focus, attention, and processing speed"),
+    ("Logic", "Logical reasoning and problem solving"),
+    ("Placement", "Initial placement assessment"),
+    ("Language", "Reading comprehension and verbal reasoning"),
+    ("Mathematics", "Quantitative and mathematical reasoning"),
+)
+
+
+# ── Synthetic data ───────────────────────────────────────────────────────────
+
+class _CountingItem(dict):
+    """Catalog row that counts field reads made through get_item_value."""
+
+    reads = 0
+
+    def get(self, key, default=None):
+        _CountingItem.reads += 1
+        return super().get(key, default)
+
+
+class _Counted:
+    """Sort-key wrapper that counts every comparison made on it."""
+
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        _Counted.comparisons += 1
+        return self.value == other.value
+
+    def __lt__(self, other):
+        _Counted.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        _Counted.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        _Counted.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        _Counted.comparisons += 1
+        return self.value >= other.value
+
+
+def make_catalog(size, seed=0):
+    """Deterministic SAMPLE_CATALOG-like rows (duplicate titles included)."""
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(size):
+        topic, description = _TOPICS[rng.randrange(len(_TOPICS))]
+        catalog.append(_CountingItem(
+            id=i + 1,
+            title=f"{topic} Test {rng.randrange(max(1, size // 4))}",
+            min_level=rng.randint(1, 100),
+            time_limit_minutes=rng.choice((10, 15, 20, 25, 30, 35, 45, 60)),
+            description=description,
+        ))
+    return catalog
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+def _timed(fn, repeat):
+    """Best wall time over ``repeat`` runs and the result of the last one."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _row(suite, algorithm, size, field="", seconds=None, operations=None, matches=None, skipped=False):
+    return {
+        "suite": suite,
+        "algorithm": algorithm,
+        "size": size,
+        "field": field,
+        "seconds": round(seconds, 6) if seconds is not None else None,
+        "operations": operations,
+        "matches": matches,
+        "skipped": skipped,
+    }
+
+
+def bench_sorts(catalog, repeat, bubble_max):
+    rows = []
+    size = len(catalog)
+    for name, sorter in SORT_ALGORITHMS.items():
+        for field in SORT_FIELDS:
+            if name == "bubble" and size > bubble_max:
+                rows.append(_row("sort", name, size, field, skipped=True))
+                continue
+            counted_key = lambda item, f=field: _Counted(get_item_value(item, f))  # noqa: E731
+            seconds, _ = _timed(lambda: sorter(catalog, key=field, decorate=True), repeat)
+            _Counted.comparisons = 0
+            sorter(catalog, key=counted_key, decorate=True)
+            rows.append(_row("sort", name, size, field, seconds, _Counted.comparisons))
+    return rows
+
+
+def _slice_len(bounds):
+    return bounds[1] - bounds[0]
+
+
+def bench_searches(catalog, repeat):
+    """Search cost only: binary (prefix mode) runs on a list sorted beforehand."""
+    rows = []
+    size = len(catalog)
+    sorted_by_title = merge_sort(catalog, key=normalized_key("title"), decorate=True)
+    index = CatalogIndex.from_items(catalog)
+
+    searches = {
+        "linear": lambda q: len(linear_search(catalog, q)),
+        "binary": lambda q: _slice_len(binary_search_range(sorted_by_title, q, key="title", prefix=True)),
+        "index": lambda q: len(index.search(q)),
+    }
+    for name in SEARCH_ALGORITHMS:
+        search = searches[name]
+        for query in QUERIES:
+            seconds, matches = _timed(lambda: search(query), repeat)
+            _CountingItem.reads = 0
+            search(query)
+            rows.append(_row("search", name, size, query, seconds, _CountingItem.reads, matches))
+    return rows
+
+
+def bench_catalog(catalog, repeat, bubble_max):
+    """
+    process_catalog end to end, with a persistent index as the API uses.
+    ``<sort>+<search>`` rows sort per request; ``snapshot+<search>`` rows read
+    a prebuilt CatalogSnapshot instead. Without a snapshot, binary search
+    bubble-sorts the list first, so it is skipped above ``bubble_max``.
+    """
+    rows = []
+    size = len(catalog)
+    index = CatalogIndex()
+    for item in catalog:
+        index.add(item["id"], item)
+    snapshot = CatalogSnapshot(catalog)
+
+    variants = [(sort_algo, sort_algo, None) for sort_algo in SORT_ALGORITHMS]
+    variants.append(("snapshot", "merge", snapshot))
+    for label, sort_algo, snap in variants:
+        for search_algo in SEARCH_ALGORITHMS:
+            name = f"{label}+{search_algo}"
+            uses_bubble = snap is None and (sort_algo == "bubble" or search_algo == "binary")
+            if uses_bubble and size > bubble_max:
+                rows.append(_row("catalog", name, size, "title", skipped=True))
+                continue
+
+            def run():
+                return process_catalog(
+                    catalog, query="Memory", sort_algo=sort_algo,
+                    search_algo=search_algo, sort_field="title", prefix=True,
+                    index=index, snapshot=snap,
+                )
+
+            seconds, result = _timed(run, repeat)
+            _CountingItem.reads = 0
+            run()
+            rows.append(_row(
+                "catalog", name, size, "title", seconds,
+                _CountingItem.reads, result["meta"]["total_after"],
+            ))
+    return rows
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, bubble_max=DEFAULT_BUBBLE_MAX, seed=0):
+    """Run every suite for every size; returns the report dict."""
+    rows = []
+    for size in sizes:
+        catalog = make_catalog(size, seed=seed)
+        rows.extend(bench_sorts(catalog, repeat, bubble_max))
+        rows.extend(bench_searches(catalog, repeat))
+        rows.extend(bench_catalog(catalog, repeat, bubble_max))
+    return {
+        "meta": {
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "bubble_max": bubble_max,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": rows,
+    }
+
+
+def write_report(report, out_dir):
+    """Write ``catalog_benchmark.json`` and ``.csv`` under ``out_dir``."""
+    os.makedirs(out_dir, exist_ok=True)
+    json_path = os.path.join(out_dir, "catalog_benchmark.json")
+    csv_path = os.path.join(out_dir, "catalog_benchmark.csv")
+    with open(json_path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+        fh.write("\n")
+    with open(csv_path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(report["results"])
+    return json_path, csv_path
+
+
+# ── Entry Point ──────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.benchmark",
+        description="Catalog algorithm benchmarks (timing + operation counts)",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Catalog sizes (default: 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per measurement; the best time is kept (default: 3)")
+    parser.add_argument("--bubble-max", type=int, default=DEFAULT_BUBBLE_MAX,
+                        help=f"Skip bubble sort above this size (default: {DEFAULT_BUBBLE_MAX})")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic catalog seed (default: 0)")
+    parser.add_argument("--out", default="benchmark_results",
+                        help="Output directory (default: benchmark_results)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeat, args.bubble_max, args.seed)
+    json_path, csv_path = write_report(report, args.out)
+    print(f"Wrote {json_path}")
+    print(f"Wrote {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
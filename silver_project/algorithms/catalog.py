@@ -1,40 +1,118 @@
 """Catalog service: apply manual search + sort to test/content lists."""
 
-from .sorting import bubble_sort, merge_sort
-from .searching import linear_search, binary_search
+from collections import deque
+
+from .sorting import (
+    bubble_sort,
+    compile_sort_key,
+    merge_sort,
+    merge_sort_iterative,
+    parse_sort_spec,
+    partial_sort,
+)
+from .searching import linear_search, binary_search_range, normalized_key
+from .indexing import CatalogIndex
+from .columnar import ColumnarCatalog
+from .normalization import collation_key, normalize_text
 from .utils import get_item_value
 
 SORT_ALGORITHMS = {
     "bubble": bubble_sort,
     "merge": merge_sort,
+    "merge_iter": merge_sort_iterative,
 }
 
 SEARCH_ALGORITHMS = {
     "linear": "linear",
     "binary": "binary",
+    "index": "index",
 }
 
 VALID_SORT_FIELDS = ("title", "min_level", "time_limit_minutes", "created_at")
 
+# Optional precomputed keys (see normalization.py); computed on the fly when absent.
+SEARCH_KEY_FIELD = "search_key"
+SORT_KEY_FIELD = "sort_key"
+
+
+def title_sort_key(item):
+    """Collation key for ``title``: the stored ``sort_key`` when present."""
+    return get_item_value(item, SORT_KEY_FIELD) or collation_key(get_item_value(item, "title"))
+
+
+class _Tally:
+    """Single-pass wrapper around an iterable that counts the items it yields."""
+
+    def __init__(self, items):
+        self._items = items
+        self.count = 0
+
+    def __iter__(self):
+        for item in self._items:
+            self.count += 1
+            yield item
+
 
-def _apply_search(items, query, search_algo, sort_field):
+def _iter_search(items, query, search_algo, index=None):
+    """Generator form of linear/index search: yields matches without building lists."""
+    if not query:
+        yield from items
+        return
+    if search_algo == "index" and index is not None:
+        matched = index.search(query)
+        for item in items:
+            if get_item_value(item, "id") in matched:
+                yield item
+        return
+    needle = normalize_text(query)
+    for item in items:
+        stored = get_item_value(item, SEARCH_KEY_FIELD)
+        if stored:
+            if needle in stored:
+                yield item
+        elif any(needle in normalize_text(get_item_value(item, f)) for f in ("title", "description")):
+            yield item
+
+
+def _apply_search(items, query, search_algo, sort_field, index=None, prefix=False, snapshot=None):
     if not query:
         return list(items)
 
+    if search_algo == "index":
+        if index is None:
+            matched = CatalogIndex.from_items(items).search(query)
+            return [items[i] for i in range(len(items)) if i in matched]
+        matched = index.search(query)
+        return [item for item in items if get_item_value(item, "id") in matched]
+
     if search_algo == "binary":
-        sorted_for_search = bubble_sort(items, key=sort_field, reverse=False)
-        idx = binary_search(sorted_for_search, query, key=sort_field)
-        if idx >= 0:
-            return [sorted_for_search[idx]]
-        return []
+        if snapshot is not None:
+            matched = snapshot.search(items, query, sort_field, prefix=prefix)
+            if matched is not None:
+                return matched
+        sorted_for_search = bubble_sort(items, key=normalized_key(sort_field), reverse=False, decorate=True)
+        start, end = binary_search_range(sorted_for_search, query, key=sort_field, prefix=prefix)
+        return sorted_for_search[start:end]
 
+    if any(get_item_value(item, SEARCH_KEY_FIELD) for item in items):
+        # rows written by bulk_create/update() may lack a stored key: normalize those per item
+        return list(_iter_search(items, query, search_algo))
     indices = linear_search(items, query)
     return [items[i] for i in indices]
 
 
-def _apply_sort(items, sort_algo, sort_field, reverse):
+def _snapshot_order(items, snapshot, spec, reverse, top_k):
+    """Snapshot order for a single-field spec (by field name), or None if the snapshot can't serve it."""
+    if snapshot is None or len(spec) != 1:
+        return None
+    return snapshot.order(items, spec[0][0], reverse=reverse, limit=top_k)
+
+
+def _apply_sort(items, sort_algo, sort_field, reverse, top_k=None):
+    if top_k is not None:
+        return partial_sort(items, top_k, key=sort_field, reverse=reverse)
     sorter = SORT_ALGORITHMS.get(sort_algo, bubble_sort)
-    return sorter(items, key=sort_field, reverse=reverse)
+    return sorter(items, key=sort_field, reverse=reverse, decorate=True)
 
 
 def process_catalog(
@@ -44,20 +122,102 @@ def process_catalog(
     search_algo="linear",
     sort_field="title",
     reverse=False,
+    index=None,
+    prefix=False,
+    snapshot=None,
+    limit=None,
+    offset=0,
 ):
     """
     Filter then sort a catalog list using user-selected algorithms.
     Returns processed list and metadata about algorithms used.
+
+    ``sort_field`` may be a composite spec such as ``"min_level,-created_at"``
+    (``-`` = descending); it is compiled once into a tuple key that every
+    sort algorithm honours. Binary search uses the first field.
+    Titles sort by their Persian collation key and search matches on
+    normalized text; items carrying precomputed ``sort_key``/``search_key``
+    values are compared on those directly.
+
+    ``index`` is an optional persistent CatalogIndex keyed by item ``id``;
+    without one, ``search_algo="index"`` builds a throwaway index per call.
+    ``prefix`` turns binary search into a prefix match on ``sort_field``.
+    ``snapshot`` is an optional CatalogSnapshot; binary search and
+    single-field sorts read its pre-sorted arrays (by field name) instead of
+    re-sorting the list per call. ``meta["snapshot_version"]`` is set only
+    when the snapshot actually produced the order.
+    ``items`` may be a ColumnarCatalog: single-field sorts then run as a
+    NumPy argsort over the column (linear/index search only); anything
+    else falls back to the list path. Any other iterable without ``len``
+    (e.g. ``queryset.iterator()``) is consumed once as a generator pipeline:
+    only matches are kept, and with ``limit`` only the current top-k (the
+    snapshot is then not used, so peak memory stays O(limit + offset)).
+    ``limit``/``offset`` select one page; only the first ``offset + limit``
+    items are ordered (heap top-k) instead of the whole filtered list.
     """
-    if sort_field not in VALID_SORT_FIELDS:
-        sort_field = "title"
+    spec = parse_sort_spec(sort_field, VALID_SORT_FIELDS) or (("title", False),)
+    sort_field = spec[0][0]
+    if len(spec) == 1:
+        sort_key = title_sort_key if sort_field == "title" else sort_field
+        reverse = reverse != spec[0][1]
+    else:
+        sort_key = compile_sort_key(tuple(
+            (title_sort_key if field == "title" else field, descending) for field, descending in spec
+        ))
     if sort_algo not in SORT_ALGORITHMS:
         sort_algo = "bubble"
     if search_algo not in SEARCH_ALGORITHMS:
         search_algo = "linear"
 
-    filtered = _apply_search(items, query.strip(), search_algo, sort_field)
-    sorted_items = _apply_sort(filtered, sort_algo, sort_field, reverse)
+    offset = max(0, offset or 0)
+    top_k = offset + max(0, limit) if limit is not None else None
+    columnar = (
+        isinstance(items, ColumnarCatalog)
+        and len(spec) == 1
+        and items.has_column(sort_field)
+        and search_algo != "binary"
+    )
+    # Unsized iterables (e.g. ``queryset.iterator()``) are filtered lazily;
+    # binary search needs random access, so it still materializes them.
+    streaming = not columnar and not hasattr(items, "__len__") and search_algo != "binary"
+    snapshot_used = False
+    if columnar:
+        filtered = items.search(query.strip(), index=index if search_algo == "index" else None)
+        sorted_items = filtered.order_by(sort_field, reverse=reverse)
+        if top_k is not None:
+            sorted_items = sorted_items[offset:top_k]
+        sorted_items = sorted_items.to_list()
+        total_matched, total_before = len(filtered), len(items)
+    elif streaming:
+        source = _Tally(items)
+        matched = _Tally(_iter_search(source, query.strip(), search_algo, index=index))
+        if top_k is not None:
+            # bounded top-k heap; a snapshot walk would need every match in memory
+            sorted_items = partial_sort(matched, top_k, key=sort_key, reverse=reverse)[offset:]
+            deque(matched, maxlen=0)  # limit=0 never pulls from the source; count it anyway
+        else:
+            filtered = list(matched)
+            sorted_items = _snapshot_order(filtered, snapshot, spec, reverse, top_k)
+            snapshot_used = sorted_items is not None
+            if not snapshot_used:
+                sorted_items = _apply_sort(filtered, sort_algo, sort_key, reverse, top_k=top_k)
+            if top_k is not None:
+                sorted_items = sorted_items[offset:top_k]
+        total_matched, total_before = matched.count, source.count
+    else:
+        if isinstance(items, ColumnarCatalog) or not hasattr(items, "__len__"):
+            items = list(items)
+        filtered = _apply_search(
+            items, query.strip(), search_algo, sort_field,
+            index=index, prefix=prefix, snapshot=snapshot,
+        )
+        sorted_items = _snapshot_order(filtered, snapshot, spec, reverse, top_k)
+        snapshot_used = sorted_items is not None
+        if not snapshot_used:
+            sorted_items = _apply_sort(filtered, sort_algo, sort_key, reverse, top_k=top_k)
+        if top_k is not None:
+            sorted_items = sorted_items[offset:top_k]
+        total_matched, total_before = len(filtered), len(items)
 
     return {
         "items": sorted_items,
@@ -66,8 +226,17 @@ def process_catalog(
             "sort_algorithm": sort_algo,
             "search_algorithm": search_algo,
             "sort_field": sort_field,
+            "sort_spec": ",".join(("-" if desc else "") + field for field, desc in spec),
             "reverse": reverse,
-            "total_before": len(items),
+            "prefix": prefix,
+            "snapshot_version": snapshot.version if snapshot_used else None,
+            "partial_sort": top_k is not None,
+            "columnar": columnar,
+            "streamed": streaming,
+            "limit": limit,
+            "offset": offset,
+            "total_matched": total_matched,
+            "total_before": total_before,
             "total_after": len(sorted_items),
         },
     }
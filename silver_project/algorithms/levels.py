@@ -0,0 +1,94 @@
+"""Bucketed interval index over ``[min_level, max_level]`` ranges (levels 1–100)."""
+
+from bisect import bisect_left, bisect_right
+
+from .sorting import merge_sort
+from .utils import get_item_value
+
+LEVEL_MIN = 1
+LEVEL_MAX = 100
+
+
+def _by_min_then_id(entry):
+    return entry[0], entry[1]
+
+
+def _by_max_desc(entry):
+    return -entry[2], entry[1]
+
+
+class LevelIndex:
+    """
+    Answer "which items overlap levels ``[lo, hi]``" without scanning every row.
+
+    Items are ``{"id", "min_level", "max_level"}`` dicts or objects. Each one
+    lands in the bucket of its ``min_level`` (clamped to LEVEL_MIN..LEVEL_MAX)
+    and every bucket is kept sorted by descending ``max_level``; an overlap
+    query visits the buckets with ``min_level <= hi`` and bisects each for
+    ``max_level >= lo`` — O(log n + k) for the fixed 100 buckets, unordered
+    unless asked. A second array sorted by ``(min_level, id)`` answers
+    ``min_level`` range queries with two bisections, already ordered like
+    ``order_by("min_level", "id")``.
+    """
+
+    def __init__(self, items=(), version=0):
+        self.version = version
+        entries = [
+            (get_item_value(item, "min_level"), get_item_value(item, "id"), get_item_value(item, "max_level"))
+            for item in items
+        ]
+        self._by_min = merge_sort(entries, key=_by_min_then_id, decorate=True)
+        self._min_keys = [(min_level, item_id) for min_level, item_id, _ in self._by_min]
+        buckets = [[] for _ in range(LEVEL_MAX - LEVEL_MIN + 1)]
+        for entry in self._by_min:
+            buckets[self._bucket(entry[0])].append(entry)
+        self._buckets = [merge_sort(b, key=_by_max_desc, decorate=True) for b in buckets]
+        # -max_level per bucket (ascending) for bisection
+        self._bucket_keys = [[-entry[2] for entry in b] for b in self._buckets]
+
+    def __len__(self):
+        return len(self._by_min)
+
+    @staticmethod
+    def _bucket(level):
+        return min(max(level, LEVEL_MIN), LEVEL_MAX) - LEVEL_MIN
+
+    def overlapping(self, lo, hi, ordered=False):
+        """
+        Ids whose range overlaps ``[lo, hi]`` (``min_level <= hi and max_level >= lo``),
+        in bucket order — O(log n + k) for the fixed buckets. ``ordered=True``
+        additionally sorts them by ``(min_level, id)``, which costs O(k log k);
+        callers that only sample from the result should leave it off.
+        """
+        found = []
+        for b in range(self._bucket(hi) + 1):
+            end = bisect_right(self._bucket_keys[b], -lo)
+            for entry in self._buckets[b][:end]:
+                if entry[0] <= hi:
+                    found.append(entry)
+        if ordered:
+            found = merge_sort(found, key=_by_min_then_id, decorate=True)
+        return [entry[1] for entry in found]
+
+    def containing(self, level, ordered=False):
+        """Ids whose range contains ``level``."""
+        return self.overlapping(level, level, ordered=ordered)
+
+    def starting_between(self, lo=None, hi=None, descending=False):
+        """
+        Ids with ``lo <= min_level <= hi`` (either bound optional), ordered by
+        ``(min_level, id)``; ``descending`` orders by ``(-min_level, id)``.
+        """
+        start = 0 if lo is None else bisect_left(self._min_keys, (lo,))
+        end = len(self._min_keys) if hi is None else bisect_left(self._min_keys, (hi + 1,))
+        window = self._min_keys[start:end]
+        if not descending:
+            return [item_id for _, item_id in window]
+        # min_level groups in reverse, ids ascending inside each group
+        ids = []
+        group_end = len(window)
+        while group_end > 0:
+            group_start = bisect_left(window, (window[group_end - 1][0],), 0, group_end)
+            ids.extend(item_id for _, item_id in window[group_start:group_end])
+            group_end = group_start
+        return ids
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mutation_runner.py — parallel runner for the hand-written mutants (Chapter 9)
+
+Discovers every ``<original>_mNN`` function in ``algorithms/mutants/*_mutants.py``
+and runs a kill check for each one in its own worker process:
+
+  * the mutant and its original are called on the same input battery;
+  * an exception, a different output, or exceeding ``--timeout`` → KILLED
+    (catalog results: ``items`` plus the meta keys the mutant returns);
+  * identical output on every case → SURVIVED (equivalent or live mutant).
+
+Each mutant runs in a separate process, so infinite loops (e.g. M-AOR-BN-04)
+are terminated at the timeout without stalling the rest of the run.
+
+Results are cached by a hash of the mutant source, the original source and
+the input battery; unchanged mutants are not re-executed.
+
+Usage:
+    cd silver_project
+    python -m algorithms.mutation_runner
+    python -m algorithms.mutation_runner --jobs 8 --timeout 2 --no-cache
+"""
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import pkgutil
+import re
+import sys
+import time
+
+_pkg_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _pkg_root not in sys.path:
+    sys.path.insert(0, _pkg_root)
+
+MUTANTS_PACKAGE = "algorithms.mutants"
+DEFAULT_CACHE = ".mutation_cache.json"
+DEFAULT_TIMEOUT = 2.0
+_MUTANT_NAME = re.compile(r"^(?P<original>\w+)_m(?P<number>\d+)$")
+
+# Where each original lives (mutants only reference it by name).
+ORIGINALS = {
+    "bubble_sort": "algorithms.sorting",
+    "merge_sort": "algorithms.sorting",
+    "binary_search": "algorithms.searching",
+    "process_catalog": "algorithms.catalog",
+}
+
+_ITEMS_2 = [
+    {"title": "b", "min_level": 2, "time_limit_minutes": 20, "description": ""},
+    {"title": "a", "min_level": 1, "time_limit_minutes": 10, "description": ""},
+]
+_ITEMS_3 = [
+    {"title": "c", "min_level": 3, "time_limit_minutes": 30, "description": ""},
+    {"title": "a", "min_level": 1, "time_limit_minutes": 10, "description": ""},
+    {"title": "b", "min_level": 2, "time_limit_minutes": 20, "description": ""},
+]
+_ITEMS_4 = [
+    {"title": "d", "min_level": 4},
+    {"title": "c", "min_level": 3},
+    {"title": "b", "min_level": 2},
+    {"title": "a", "min_level": 1},
+]
+_SORTED_5 = [{"title": t} for t in "abcde"]
+
+# Input battery per original: list of (args, kwargs).
+KILL_CASES = {
+    "bubble_sort": [
+        ((items,), {"key": key, "reverse": reverse})
+        for items in (_ITEMS_2, _ITEMS_3, _ITEMS_4)
+        for key in ("title", "min_level")
+        for reverse in (False, True)
+    ],
+    "binary_search": [
+        ((_SORTED_5, query), {"key": "title"})
+        for query in ("a", "b", "c", "d", "e", "x")
+    ],
+    "process_catalog": [
+        ((items,), kwargs)
+        for items in (_ITEMS_3, _ITEMS_2)
+        for kwargs in ({}, {"query": "a"}, {"sort_algo": "merge", "sort_field": "min_level"})
+    ],
+}
+KILL_CASES["merge_sort"] = KILL_CASES["bubble_sort"]
+
+
+# ── Discovery ────────────────────────────────────────────────────────────────
+
+def _source_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def discover_mutants(package=MUTANTS_PACKAGE):
+    """
+    Return one spec dict per mutant function, sorted by module and name:
+    ``{"id", "module", "name", "original", "hash"}``.
+    """
+    pkg = importlib.import_module(package)
+    specs = []
+    for info in pkgutil.iter_modules(pkg.__path__):
+        if not info.name.endswith("_mutants"):
+            continue
+        module_name = f"{package}.{info.name}"
+        module = importlib.import_module(module_name)
+        for name, fn in inspect.getmembers(module, inspect.isfunction):
+            match = _MUTANT_NAME.match(name)
+            if fn.__module__ != module_name or not match:
+                continue
+            original = match.group("original")
+            if original not in ORIGINALS:
+                continue
+            original_fn = getattr(importlib.import_module(ORIGINALS[original]), original)
+            specs.append({
+                "id": f"{info.name}:{name}",
+                "module": module_name,
+                "name": name,
+                "original": original,
+                "hash": _source_hash(
+                    inspect.getsource(fn),
+                    inspect.getsource(original_fn),
+                    repr(KILL_CASES[original]),
+                ),
+            })
+    specs.sort(key=lambda spec: spec["id"])
+    return specs
+
+
+# ── Kill check (runs inside the worker process) ──────────────────────────────
+
+def _outputs_match(got, expected):
+    """
+    Compare a mutant's output with the original's.
+
+    ``process_catalog`` results are compared on ``items`` plus the meta keys
+    the mutant itself returns: the mutants are copies of the baseline, so
+    meta keys the original gained later must not count as a kill.
+    """
+    if (
+        isinstance(got, dict) and isinstance(expected, dict)
+        and set(got) == {"items", "meta"} and set(expected) == {"items", "meta"}
+    ):
+        if got["items"] != expected["items"]:
+            return False
+        return all(key in expected["meta"] and expected["meta"][key] == value for key, value in got["meta"].items())
+    return got == expected
+
+
+def kill_check(module_name, name, original):
+    """Return ``(status, detail)`` for one mutant against its original."""
+    mutant = getattr(importlib.import_module(module_name), name)
+    reference = getattr(importlib.import_module(ORIGINALS[original]), original)
+    for i, (args, kwargs) in enumerate(KILL_CASES[original]):
+        expected = reference(*args, **kwargs)
+        try:
+            got = mutant(*args, **kwargs)
+        except BaseException as exc:  # RecursionError, IndexError, ...
+            return "killed", f"case {i}: {type(exc).__name__}"
+        if not _outputs_match(got, expected):
+            return "killed", f"case {i}: output differs"
+    return "survived", f"{len(KILL_CASES[original])} cases identical"
+
+
+def _worker(conn, module_name, name, original):
+    try:
+        conn.send(kill_check(module_name, name, original))
+    except BaseException as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+# ── Scheduling ───────────────────────────────────────────────────────────────
+
+def _execute(specs, jobs, timeout):
+    """Run kill checks with at most ``jobs`` live processes; yields (spec, status, detail, seconds)."""
+    pending = list(specs)
+    running = []
+    while pending or running:
+        while pending and len(running) < jobs:
+            spec = pending.pop(0)
+            parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+            proc = multiprocessing.Process(
+                target=_worker,
+                args=(child_conn, spec["module"], spec["name"], spec["original"]),
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            running.append((spec, proc, parent_conn, time.monotonic()))
+
+        still_running = []
+        for spec, proc, conn, started in running:
+            elapsed = time.monotonic() - started
+            if conn.poll() or not proc.is_alive():
+                if conn.poll():
+                    status, detail = conn.recv()
+                else:
+                    status, detail = "killed", f"worker exited with code {proc.exitcode}"
+                proc.join()
+            elif elapsed > timeout:
+                proc.terminate()
+                proc.join()
+                status, detail = "killed", f"timeout after {timeout:g}s"
+            else:
+                still_running.append((spec, proc, conn, started))
+                continue
+            conn.close()
+            yield spec, status, detail, round(elapsed, 3)
+        running = still_running
+        if running:
+            time.sleep(0.01)
+
+
+def _load_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def run_mutants(specs=None, jobs=None, timeout=DEFAULT_TIMEOUT, cache_path=DEFAULT_CACHE):
+    """
+    Run (or reuse cached) kill checks for every mutant.
+    Returns result dicts in spec order, each with ``status``, ``detail``,
+    ``seconds`` and ``cached``.
+    """
+    if specs is None:
+        specs = discover_mutants()
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    cache = _load_cache(cache_path)
+
+    results = {}
+    stale = []
+    for spec in specs:
+        hit = cache.get(spec["id"])
+        if hit and hit.get("hash") == spec["hash"]:
+            results[spec["id"]] = dict(spec, status=hit["status"], detail=hit["detail"],
+                                       seconds=hit["seconds"], cached=True)
+        else:
+            stale.append(spec)
+
+    for spec, status, detail, seconds in _execute(stale, jobs, timeout):
+        results[spec["id"]] = dict(spec, status=status, detail=detail, seconds=seconds, cached=False)
+        if status != "error":
+            cache[spec["id"]] = {"hash": spec["hash"], "status": status, "detail": detail, "seconds": seconds}
+
+    known = {spec["id"] for spec in specs}
+    _save_cache(cache_path, {k: v for k, v in cache.items() if k in known})
+    return [results[spec["id"]] for spec in specs]
+
+
+def mutation_score(results):
+    """Killed / total, in percent (equivalent mutants are not excluded automatically)."""
+    if not results:
+        return 0.0
+    killed = sum(1 for r in results if r["status"] == "killed")
+    return killed / len(results) * 100
+
+
+# ── Entry Point ──────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m algorithms.mutation_runner",
+        description="Parallel kill checks for algorithms/mutants (cached by source hash)",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds per mutant before it counts as killed (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help=f"Cache file (default: {DEFAULT_CACHE})")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the cache")
+    args = parser.parse_args(argv)
+
+    results = run_mutants(
+        jobs=args.jobs,
+        timeout=args.timeout,
+        cache_path=None if args.no_cache else args.cache,
+    )
+    for r in results:
+        source = "cache" if r["cached"] else f"{r['seconds']:.2f}s"
+        print(f"  {r['id']:<40} {r['status'].upper():<9} {source:>7}  {r['detail']}")
+    print(f"\n  Mutation score: {mutation_score(results):.1f}% "
+          f"({sum(r['status'] == 'killed' for r in results)}/{len(results)} killed)")
+
+
+if __name__ == "__main__":
+    main()
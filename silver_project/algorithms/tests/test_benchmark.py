@@ -0,0 +1,42 @@
+import csv
+import json
+
+from algorithms.benchmark import make_catalog, run_benchmarks, write_report
+from algorithms.catalog import SEARCH_ALGORITHMS, SORT_ALGORITHMS
+
+
+def test_make_catalog_is_deterministic():
+    assert make_catalog(50, seed=7) == make_catalog(50, seed=7)
+    assert make_catalog(50, seed=7) != make_catalog(50, seed=8)
+
+
+def test_report_covers_every_algorithm(tmp_path):
+    report = run_benchmarks(sizes=(40, 80), repeat=1, bubble_max=40)
+    rows = report["results"]
+
+    sort_rows = {r["algorithm"] for r in rows if r["suite"] == "sort"}
+    search_rows = {r["algorithm"] for r in rows if r["suite"] == "search"}
+    assert sort_rows == set(SORT_ALGORITHMS)
+    assert search_rows == set(SEARCH_ALGORITHMS)
+
+    bubble_80 = [r for r in rows if r["suite"] == "sort" and r["algorithm"] == "bubble" and r["size"] == 80]
+    assert bubble_80 and all(r["skipped"] for r in bubble_80)
+
+    merge_rows = [r for r in rows if r["suite"] == "sort" and r["algorithm"] == "merge" and r["field"] == "title"]
+    assert merge_rows[0]["operations"] < merge_rows[1]["operations"]
+
+    json_path, csv_path = write_report(report, tmp_path)
+    with open(json_path, encoding="utf-8") as fh:
+        assert json.load(fh)["results"] == rows
+    with open(csv_path, encoding="utf-8") as fh:
+        assert len(list(csv.DictReader(fh))) == len(rows)
+
+
+def test_search_algorithms_agree_on_matches():
+    report = run_benchmarks(sizes=(60,), repeat=1)
+    catalog_rows = [r for r in report["results"] if r["suite"] == "catalog" and not r["skipped"]]
+    by_search = {}
+    for r in catalog_rows:
+        by_search.setdefault(r["algorithm"].split("+")[1], set()).add(r["matches"])
+    assert len(by_search["linear"]) == 1
+    assert by_search["linear"] == by_search["index"]
@@ -1,8 +1,20 @@
 import pytest
 
-from algorithms.sorting import bubble_sort, merge_sort
-from algorithms.searching import linear_search, binary_search
-from algorithms.catalog import process_catalog, get_item_value
+from algorithms.sorting import (
+    bubble_sort,
+    compile_sort_key,
+    merge_sort,
+    merge_sort_iterative,
+    parse_sort_spec,
+    partial_sort,
+)
+from algorithms.searching import linear_search, binary_search, binary_search_range, normalized_key
+from algorithms.indexing import CatalogIndex
+from algorithms.snapshots import CatalogSnapshot
+from algorithms.columnar import ColumnarCatalog, numpy_available
+from algorithms.levels import LevelIndex
+from algorithms.normalization import collation_key, normalize_text, search_key
+from algorithms.catalog import VALID_SORT_FIELDS, process_catalog, get_item_value
 
 
 # --- fixtures ---
@@ -22,9 +34,9 @@ def sample_items():
 SIZE_VALUES = [[], [{"title": "a", "min_level": 1}], [{"title": "b", "min_level": 2}, {"title": "a", "min_level": 1}]]
 ORDER_VALUES = ["sorted", "reverse", "random"]
 SORT_FIELD_VALUES = ["title", "min_level", "time_limit_minutes"]
-SORT_ALGO_VALUES = ["bubble", "merge"]
+SORT_ALGO_VALUES = ["bubble", "merge", "merge_iter"]
 QUERY_VALUES = ["", "آزمون", "ناموجود"]
-SEARCH_ALGO_VALUES = ["linear", "binary"]
+SEARCH_ALGO_VALUES = ["linear", "binary", "index"]
 
 
 def _ordered_items(order, base=None):
@@ -223,3 +235,487 @@ class TestPrimePathCoverage:
     def test_linear_search_multiple_fields(self):
         items = [{"title": "x", "description": "حافظه"}, {"title": "y", "description": "other"}]
         assert linear_search(items, "حافظه") == [0]
+
+
+class TestCatalogIndex:
+    """Inverted n-gram index must agree with linear_search."""
+
+    QUERIES = ["", "آ", "آز", "آزمون", "حافظه", "تست تمرکز", "PLACE", "ment", "xyz_not_found", "ن م"]
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_index_matches_linear(self, sample_items, query):
+        index = CatalogIndex.from_items(sample_items)
+        assert sorted(index.search(query)) == linear_search(sample_items, query)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_catalog_index_path_matches_linear(self, sample_items, query):
+        by_index = process_catalog(sample_items, query=query, search_algo="index")
+        by_linear = process_catalog(sample_items, query=query, search_algo="linear")
+        assert by_index["items"] == by_linear["items"]
+        assert by_index["meta"]["search_algorithm"] == "index"
+
+    def test_persistent_index_filters_by_id(self, sample_items):
+        items = [dict(item, id=i + 100) for i, item in enumerate(sample_items)]
+        index = CatalogIndex()
+        for item in items:
+            index.add(item["id"], item)
+        result = process_catalog(items[1:], query="آزمون", search_algo="index", index=index)
+        assert [x["id"] for x in result["items"]] == [101, 102]
+
+    def test_incremental_update_and_remove(self):
+        index = CatalogIndex()
+        index.add(1, {"title": "Memory", "description": ""})
+        index.add(2, {"title": "Logic", "description": "memory drills"})
+        assert index.search("memo") == {1, 2}
+
+        index.add(1, {"title": "Focus", "description": ""})
+        assert index.search("memo") == {2}
+        assert index.search("focus") == {1}
+
+        index.remove(2)
+        assert index.search("memo") == set()
+        assert 2 not in index
+        assert len(index) == 1
+
+    def test_remove_unknown_id_is_noop(self):
+        index = CatalogIndex()
+        index.remove(42)
+        assert len(index) == 0
+
+
+class TestBinarySearchRange:
+    """Bisect-style bounds: full slice for duplicates and prefixes."""
+
+    TITLES = [{"title": t} for t in ["Alpha", "alpha", "Alphabet", "beta", "Beta", "gamma"]]
+
+    def _sorted(self):
+        return merge_sort(self.TITLES, key=normalized_key("title"))
+
+    def test_exact_returns_all_duplicates(self):
+        items = self._sorted()
+        start, end = binary_search_range(items, "ALPHA", key="title")
+        assert sorted(x["title"] for x in items[start:end]) == ["Alpha", "alpha"]
+
+    def test_prefix_returns_contiguous_slice(self):
+        items = self._sorted()
+        start, end = binary_search_range(items, "alp", key="title", prefix=True)
+        assert sorted(x["title"] for x in items[start:end]) == ["Alpha", "Alphabet", "alpha"]
+
+    def test_not_found_is_empty_slice(self):
+        items = self._sorted()
+        start, end = binary_search_range(items, "delta", key="title", prefix=True)
+        assert start == end
+
+    def test_empty_query_and_empty_list(self):
+        assert binary_search_range([], "a") == (0, 0)
+        assert binary_search_range(self._sorted(), "") == (0, 0)
+
+    def test_numeric_key_coerces_query(self):
+        items = [{"min_level": v} for v in [1, 5, 5, 10, 50]]
+        assert binary_search_range(items, "5", key="min_level") == (1, 3)
+        assert binary_search_range(items, "10", key="min_level", prefix=True) == (3, 4)
+        assert binary_search_range(items, "abc", key="min_level") == (0, 0)
+
+    def test_catalog_binary_keeps_duplicate_titles(self):
+        items = [
+            {"title": "Memory", "min_level": 1},
+            {"title": "Logic", "min_level": 2},
+            {"title": "memory", "min_level": 3},
+        ]
+        result = process_catalog(items, query="memory", search_algo="binary", sort_field="title")
+        assert sorted(x["min_level"] for x in result["items"]) == [1, 3]
+
+    def test_catalog_binary_prefix(self, sample_items):
+        result = process_catalog(sample_items, query="آزمون", search_algo="binary", prefix=True)
+        assert result["meta"]["prefix"] is True
+        assert result["meta"]["total_after"] == 3
+
+    @pytest.mark.parametrize("sort_field", ["min_level", "time_limit_minutes"])
+    def test_catalog_binary_numeric_fields(self, sample_items, sort_field):
+        value = sample_items[0][sort_field]
+        result = process_catalog(sample_items, query=str(value), search_algo="binary", sort_field=sort_field)
+        assert [get_item_value(x, sort_field) for x in result["items"]] == [value]
+
+
+class TestCatalogSnapshot:
+    """Pre-sorted snapshots must agree with sorting the list per request."""
+
+    @pytest.fixture
+    def items(self, sample_items):
+        return [dict(item, id=i + 1) for i, item in enumerate(sample_items)]
+
+    @pytest.mark.parametrize("sort_field", SORT_FIELD_VALUES)
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_sort_matches_merge(self, items, sort_field, reverse):
+        snapshot = CatalogSnapshot(items, version=3)
+        with_snapshot = process_catalog(items, sort_field=sort_field, reverse=reverse, snapshot=snapshot)
+        without = process_catalog(items, sort_algo="merge", sort_field=sort_field, reverse=reverse)
+        assert with_snapshot["items"] == without["items"]
+        assert with_snapshot["meta"]["snapshot_version"] == 3
+
+    @pytest.mark.parametrize("sort_field", ["-min_level", "min_level", "-time_limit_minutes"])
+    def test_descending_keeps_ties_in_input_order(self, sort_field):
+        items = [{"id": i, "title": f"t{i % 3}", "min_level": i % 4, "time_limit_minutes": 10 * (i % 2),
+                  "created_at": ""} for i in range(1, 25)]
+        snapshot = CatalogSnapshot(items)
+        for limit in (None, 5):
+            got = process_catalog(items, sort_field=sort_field, snapshot=snapshot, limit=limit)
+            want = process_catalog(items, sort_algo="merge", sort_field=sort_field, limit=limit)
+            assert got["meta"]["snapshot_version"] is not None
+            assert [x["id"] for x in got["items"]] == [x["id"] for x in want["items"]]
+
+    def test_binary_search_reads_snapshot_subset(self, items):
+        snapshot = CatalogSnapshot(items)
+        subset = [x for x in items if x["id"] != 1]
+        result = process_catalog(subset, query="آزمون", search_algo="binary", prefix=True, snapshot=snapshot)
+        assert sorted(x["id"] for x in result["items"]) == [2, 3]
+
+    def test_unknown_item_falls_back_to_sorter(self, items):
+        snapshot = CatalogSnapshot(items[:2])
+        assert snapshot.order(items, "title") is None
+        result = process_catalog(items, sort_field="min_level", snapshot=snapshot)
+        assert [x["min_level"] for x in result["items"]] == [1, 5, 10, 15]
+        assert result["meta"]["snapshot_version"] is None
+
+    @pytest.mark.parametrize("sort_field,expected", [("title", ["title"]), ("-title", ["title"]), ("min_level,title", [])])
+    def test_snapshot_is_asked_by_field_name(self, items, sort_field, expected, monkeypatch):
+        snapshot = CatalogSnapshot(items, version=5)
+        asked = []
+        order = snapshot.order
+
+        def spy(rows, field, **kwargs):
+            asked.append(field)
+            return order(rows, field, **kwargs)
+
+        monkeypatch.setattr(snapshot, "order", spy)
+        result = process_catalog(items, sort_field=sort_field, snapshot=snapshot)
+        assert asked == expected
+        assert result["meta"]["snapshot_version"] == (5 if expected else None)
+
+    def test_sorted_by_field(self, items):
+        snapshot = CatalogSnapshot(items)
+        assert len(snapshot) == 4
+        assert [x["min_level"] for x in snapshot.sorted_by("min_level")] == [1, 5, 10, 15]
+
+
+class TestDecoratedSort:
+    """decorate=True must produce exactly the undecorated order (incl. ties)."""
+
+    ITEMS = [
+        {"title": "b", "min_level": 2, "tag": 0},
+        {"title": "a", "min_level": 1, "tag": 1},
+        {"title": "c", "min_level": 2, "tag": 2},
+        {"title": "a", "min_level": 3, "tag": 3},
+        {"title": "b", "min_level": 1, "tag": 4},
+    ]
+
+    @pytest.mark.parametrize("sorter", [bubble_sort, merge_sort, merge_sort_iterative])
+    @pytest.mark.parametrize("key", ["title", "min_level"])
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_decorated_matches_plain(self, sorter, key, reverse):
+        plain = sorter(self.ITEMS, key=key, reverse=reverse)
+        decorated = sorter(self.ITEMS, key=key, reverse=reverse, decorate=True)
+        assert [x["tag"] for x in decorated] == [x["tag"] for x in plain]
+
+    @pytest.mark.parametrize("sorter", [bubble_sort, merge_sort, merge_sort_iterative])
+    def test_decorated_reads_each_key_once(self, sorter):
+        calls = []
+
+        def key(item):
+            calls.append(item["tag"])
+            return item["min_level"]
+
+        sorter(self.ITEMS, key=key, decorate=True)
+        assert sorted(calls) == [x["tag"] for x in self.ITEMS]
+
+    @pytest.mark.parametrize("sorter", [bubble_sort, merge_sort, merge_sort_iterative])
+    def test_decorated_small_inputs(self, sorter):
+        assert sorter([], decorate=True) == []
+        assert sorter([{"title": "x"}], decorate=True) == [{"title": "x"}]
+
+
+class TestIterativeMergeSort:
+    """Bottom-up merge sort: same stable order as the recursive version."""
+
+    @pytest.mark.parametrize("n", [2, 3, 5, 8, 13, 64])
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_matches_recursive(self, n, reverse):
+        items = [{"min_level": (i * 7) % 5, "tag": i} for i in range(n)]
+        expected = merge_sort(items, key="min_level", reverse=reverse)
+        got = merge_sort_iterative(items, key="min_level", reverse=reverse)
+        assert [x["tag"] for x in got] == [x["tag"] for x in expected]
+
+    def test_no_recursion_limit(self):
+        import sys
+        n = sys.getrecursionlimit() * 4
+        items = [{"min_level": n - i} for i in range(n)]
+        result = merge_sort_iterative(items, key="min_level", decorate=True)
+        assert result[0]["min_level"] == 1
+        assert result[-1]["min_level"] == n
+
+    def test_catalog_merge_iter(self, sample_items):
+        result = process_catalog(sample_items, sort_algo="merge_iter", sort_field="min_level")
+        assert result["meta"]["sort_algorithm"] == "merge_iter"
+        assert [x["min_level"] for x in result["items"]] == [1, 5, 10, 15]
+
+
+class TestPartialSort:
+    """Heap top-k must equal the head of the full stable sort."""
+
+    ITEMS = [{"min_level": (i * 7) % 6, "tag": i} for i in range(20)]
+
+    @pytest.mark.parametrize("k", [0, 1, 3, 7, 19, 20, 25])
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_matches_full_sort_prefix(self, k, reverse):
+        expected = merge_sort(self.ITEMS, key="min_level", reverse=reverse)[:k]
+        got = partial_sort(self.ITEMS, k, key="min_level", reverse=reverse)
+        assert [x["tag"] for x in got] == [x["tag"] for x in expected]
+
+    @pytest.mark.parametrize("offset", [0, 2, 5])
+    def test_catalog_page(self, offset):
+        items = [{"title": f"t{i:02d}", "description": ""} for i in range(12)]
+        full = process_catalog(items, sort_algo="merge")
+        page = process_catalog(items, limit=4, offset=offset)
+        assert page["items"] == full["items"][offset:offset + 4]
+        assert page["meta"]["partial_sort"] is True
+        assert page["meta"]["total_matched"] == 12
+        assert page["meta"]["total_after"] == len(page["items"])
+
+    def test_catalog_page_from_snapshot(self, sample_items):
+        items = [dict(item, id=i + 1) for i, item in enumerate(sample_items)]
+        snapshot = CatalogSnapshot(items)
+        page = process_catalog(items, sort_field="min_level", limit=2, offset=1, snapshot=snapshot)
+        assert [x["min_level"] for x in page["items"]] == [5, 10]
+
+    def test_catalog_without_limit_is_full_sort(self, sample_items):
+        result = process_catalog(sample_items)
+        assert result["meta"]["partial_sort"] is False
+        assert result["meta"]["total_after"] == len(sample_items)
+
+
+class TestCompositeSortSpec:
+    """Multi-key, mixed-direction specs compiled into one tuple key."""
+
+    ITEMS = [
+        {"title": "b", "min_level": 2, "time_limit_minutes": 10},
+        {"title": "a", "min_level": 1, "time_limit_minutes": 30},
+        {"title": "c", "min_level": 2, "time_limit_minutes": 40},
+        {"title": "d", "min_level": 1, "time_limit_minutes": 20},
+    ]
+
+    def test_parse_drops_unknown_and_repeated(self):
+        spec = parse_sort_spec("min_level, -time_limit_minutes,bogus,min_level", VALID_SORT_FIELDS)
+        assert spec == (("min_level", False), ("time_limit_minutes", True))
+
+    def test_compiled_key_is_cached(self):
+        spec = (("min_level", False), ("title", True))
+        assert compile_sort_key(spec) is compile_sort_key(spec)
+
+    @pytest.mark.parametrize("sort_algo", SORT_ALGO_VALUES)
+    def test_mixed_direction_every_algorithm(self, sort_algo):
+        result = process_catalog(self.ITEMS, sort_algo=sort_algo, sort_field="min_level,-time_limit_minutes")
+        assert [x["title"] for x in result["items"]] == ["a", "d", "c", "b"]
+        assert result["meta"]["sort_spec"] == "min_level,-time_limit_minutes"
+
+    def test_mixed_direction_reverse_flag(self):
+        result = process_catalog(self.ITEMS, sort_field="min_level,-time_limit_minutes", reverse=True)
+        assert [x["title"] for x in result["items"]] == ["b", "c", "d", "a"]
+
+    def test_mixed_direction_partial_sort(self):
+        result = process_catalog(self.ITEMS, sort_field="min_level,-time_limit_minutes", limit=2)
+        assert [x["title"] for x in result["items"]] == ["a", "d"]
+
+    def test_single_descending_field_flips_reverse(self):
+        result = process_catalog(self.ITEMS, sort_algo="merge", sort_field="-title")
+        assert [x["title"] for x in result["items"]] == ["d", "c", "b", "a"]
+        assert result["meta"]["reverse"] is True
+        assert result["meta"]["sort_field"] == "title"
+
+    def test_invalid_spec_defaults_to_title(self):
+        result = process_catalog(self.ITEMS, sort_field="bogus,-nope")
+        assert result["meta"]["sort_spec"] == "title"
+
+
+@pytest.mark.skipif(not numpy_available(), reason="numpy not installed")
+class TestColumnarCatalog:
+    """Vectorized filter/argsort must agree with the list path."""
+
+    ITEMS = [
+        {"id": i + 1, "title": t, "min_level": lvl, "time_limit_minutes": tl, "description": ""}
+        for i, (t, lvl, tl) in enumerate([
+            ("c", 3, 30), ("a", 1, 10), ("b", 3, 20), ("a", 2, 10), ("d", 1, 40),
+        ])
+    ]
+
+    def test_views_return_original_objects(self):
+        catalog = ColumnarCatalog(self.ITEMS)
+        assert len(catalog) == 5
+        assert all(a is b for a, b in zip(catalog.to_list(), self.ITEMS))
+        assert catalog[1] is self.ITEMS[1]
+
+    def test_filter_level(self):
+        catalog = ColumnarCatalog(self.ITEMS).filter_level(2)
+        assert [x["id"] for x in catalog] == [2, 4, 5]
+
+    @pytest.mark.parametrize("field", SORT_FIELD_VALUES)
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_order_by_matches_stable_sort(self, field, reverse):
+        expected = merge_sort(self.ITEMS, key=field, reverse=reverse)
+        got = ColumnarCatalog(self.ITEMS).order_by(field, reverse=reverse).to_list()
+        assert [x["id"] for x in got] == [x["id"] for x in expected]
+
+    @pytest.mark.parametrize("search_algo", ["linear", "index"])
+    @pytest.mark.parametrize("query", ["", "a", "zz"])
+    def test_process_catalog_matches_list_path(self, search_algo, query):
+        index = CatalogIndex()
+        for item in self.ITEMS:
+            index.add(item["id"], item)
+        kwargs = dict(query=query, search_algo=search_algo, sort_field="-min_level", index=index)
+        expected = process_catalog(self.ITEMS, sort_algo="merge", **kwargs)
+        got = process_catalog(ColumnarCatalog(self.ITEMS), **kwargs)
+        assert got["items"] == expected["items"]
+        assert got["meta"]["columnar"] is True
+        assert got["meta"]["total_matched"] == expected["meta"]["total_matched"]
+
+    def test_page_and_fallbacks(self):
+        catalog = ColumnarCatalog(self.ITEMS)
+        page = process_catalog(catalog, sort_field="title", limit=2, offset=1)
+        assert [x["id"] for x in page["items"]] == [4, 3]
+        composite = process_catalog(catalog, sort_field="min_level,-title")
+        assert composite["meta"]["columnar"] is False
+        assert [x["id"] for x in composite["items"]] == [5, 2, 4, 1, 3]
+
+
+class TestPersianNormalization:
+    """Arabic/Persian variants, ZWNJ and digits must match; titles sort in alphabet order."""
+
+    def test_normalize_variants(self):
+        assert normalize_text("كتاب علمي") == normalize_text("کتاب علمی")
+        assert normalize_text("می\u200cرود") == "می رود"
+        assert normalize_text("آزمون ۱۲") == normalize_text("آزمون ١٢") == "آزمون 12"
+        assert normalize_text("  Memory\tTEST ") == "memory test"
+
+    def test_collation_follows_persian_alphabet(self):
+        words = ["گل", "ژاله", "کتاب", "پدر", "یاس", "بابا", "چای", "الف"]
+        ordered = sorted(words, key=collation_key)
+        assert ordered == ["الف", "بابا", "پدر", "چای", "ژاله", "کتاب", "گل", "یاس"]
+
+    def test_search_key_keeps_fields_apart(self):
+        assert search_key("Alpha", "Beta") == "alpha\nbeta"
+        assert "a b" not in search_key("Alpha", "Beta")
+
+    @pytest.mark.parametrize("search_algo", ["linear", "index", "binary"])
+    def test_catalog_matches_arabic_spelling(self, search_algo):
+        items = [
+            {"id": 1, "title": "آزمون علمی", "description": ""},
+            {"id": 2, "title": "آزمون ریاضی", "description": ""},
+        ]
+        result = process_catalog(items, query="آزمون علمي", search_algo=search_algo)
+        assert [x["id"] for x in result["items"]] == [1]
+
+    def test_catalog_uses_precomputed_keys(self):
+        items = [
+            {"title": "گل", "sort_key": collation_key("گل"), "search_key": search_key("گل", "")},
+            {"title": "پدر", "sort_key": collation_key("پدر"), "search_key": search_key("پدر", "")},
+            {"title": "کتاب", "sort_key": collation_key("کتاب"), "search_key": search_key("کتاب", "کلاس")},
+        ]
+        result = process_catalog(items, sort_algo="merge")
+        assert [x["title"] for x in result["items"]] == ["پدر", "کتاب", "گل"]
+        result = process_catalog(items, query="كلاس")
+        assert [x["title"] for x in result["items"]] == ["کتاب"]
+
+    def test_rows_without_stored_key_fall_back_per_item(self):
+        items = [
+            {"id": 1, "title": "Alpha", "description": "", "search_key": search_key("Alpha", "")},
+            {"id": 2, "title": "Alpha two", "description": "", "search_key": ""},
+            {"id": 3, "title": "Beta", "description": "", "search_key": ""},
+        ]
+        listed = process_catalog(items, query="alpha")
+        streamed = process_catalog(iter(items), query="alpha")
+        assert [x["id"] for x in listed["items"]] == [x["id"] for x in streamed["items"]] == [1, 2]
+
+
+class TestStreamingPipeline:
+    """Unsized iterables go through the generator pipeline with list-path results."""
+
+    ITEMS = [
+        {"id": i + 1, "title": t, "min_level": lvl, "time_limit_minutes": 10, "description": d}
+        for i, (t, lvl, d) in enumerate([
+            ("Memory B", 3, ""), ("Logic", 1, "memory"), ("Memory A", 2, ""), ("Focus", 5, ""),
+        ])
+    ]
+
+    @pytest.mark.parametrize("search_algo", SEARCH_ALGO_VALUES)
+    @pytest.mark.parametrize("query", ["", "memory", "zzz"])
+    @pytest.mark.parametrize("limit", [None, 0, 2])
+    def test_generator_matches_list(self, search_algo, query, limit):
+        kwargs = dict(query=query, search_algo=search_algo, sort_algo="merge", limit=limit, offset=1)
+        expected = process_catalog(list(self.ITEMS), **kwargs)
+        got = process_catalog((item for item in self.ITEMS), **kwargs)
+        assert got["items"] == expected["items"]
+        for field in ("total_before", "total_matched", "total_after"):
+            assert got["meta"][field] == expected["meta"][field]
+        assert got["meta"]["streamed"] is (search_algo != "binary")
+
+    def test_partial_sort_consumes_iterator_once(self):
+        consumed = []
+
+        def rows():
+            for item in self.ITEMS:
+                consumed.append(item["id"])
+                yield item
+
+        top = partial_sort(rows(), 2, key="min_level")
+        assert [x["id"] for x in top] == [2, 3]
+        assert consumed == [1, 2, 3, 4]
+
+    def test_paged_stream_uses_heap_even_with_snapshot(self, monkeypatch):
+        snapshot = CatalogSnapshot(self.ITEMS, version=2)
+        monkeypatch.setattr(snapshot, "order", lambda *a, **k: pytest.fail("snapshot walk materializes the stream"))
+        got = process_catalog((item for item in self.ITEMS), sort_field="min_level", limit=2, snapshot=snapshot)
+        assert [x["id"] for x in got["items"]] == [2, 3]
+        assert got["meta"]["streamed"] is True
+        assert got["meta"]["snapshot_version"] is None
+
+
+class TestLevelIndex:
+    """Bucketed interval queries must match a brute-force scan ordered by (min_level, id)."""
+
+    ITEMS = [
+        {"id": i, "min_level": lo, "max_level": hi}
+        for i, (lo, hi) in enumerate([
+            (1, 100), (10, 20), (15, 15), (30, 60), (10, 12), (55, 100), (0, 5), (99, 120), (40, 45),
+        ], start=1)
+    ]
+
+    @staticmethod
+    def brute(predicate, descending=False):
+        rows = [x for x in TestLevelIndex.ITEMS if predicate(x)]
+        key = (lambda x: (-x["min_level"], x["id"])) if descending else (lambda x: (x["min_level"], x["id"]))
+        return [x["id"] for x in merge_sort(rows, key=key)]
+
+    @pytest.mark.parametrize("lo,hi", [(1, 1), (12, 12), (10, 20), (35, 55), (95, 100), (-3, 0), (120, 130), (20, 10)])
+    def test_overlapping_matches_scan(self, lo, hi):
+        index = LevelIndex(self.ITEMS)
+        expected = self.brute(lambda x: x["min_level"] <= hi and x["max_level"] >= lo)
+        assert index.overlapping(lo, hi, ordered=True) == expected
+        assert sorted(index.overlapping(lo, hi)) == sorted(expected)
+
+    def test_containing(self):
+        assert LevelIndex(self.ITEMS).containing(15, ordered=True) == [1, 2, 3]
+
+    @pytest.mark.parametrize("lo,hi", [(None, None), (None, 15), (16, None), (10, 10), (50, 40)])
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_starting_between_matches_scan(self, lo, hi, descending):
+        index = LevelIndex(self.ITEMS)
+        expected = self.brute(
+            lambda x: (lo is None or x["min_level"] >= lo) and (hi is None or x["min_level"] <= hi),
+            descending=descending,
+        )
+        assert index.starting_between(lo, hi, descending=descending) == expected
+
+    def test_empty_and_version(self):
+        index = LevelIndex([], version=3)
+        assert len(index) == 0
+        assert index.version == 3
+        assert index.overlapping(1, 100) == []
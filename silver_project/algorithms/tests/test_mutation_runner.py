@@ -0,0 +1,55 @@
+import inspect
+
+from algorithms.mutants import catalog_mutants
+from algorithms.mutation_runner import discover_mutants, kill_check, mutation_score, run_mutants
+
+EQUIVALENT = {"sorting_mutants:merge_sort_m03", "searching_mutants:binary_search_m03"}
+
+
+def test_discovers_every_mutant():
+    ids = {spec["id"] for spec in discover_mutants()}
+    assert len(ids) == 14
+    assert "sorting_mutants:bubble_sort_m01" in ids
+    assert "catalog_mutants:process_catalog_m02" in ids
+
+
+def test_parallel_run_kills_all_but_equivalents(tmp_path):
+    cache = tmp_path / "cache.json"
+    results = run_mutants(jobs=4, timeout=0.5, cache_path=str(cache))
+    survived = {r["id"] for r in results if r["status"] == "survived"}
+    assert survived == EQUIVALENT
+    assert all(r["status"] == "killed" for r in results if r["id"] not in EQUIVALENT)
+
+    looping = {r["id"]: r["detail"] for r in results if r["id"].startswith("searching_mutants:binary_search_m0")}
+    assert looping["searching_mutants:binary_search_m04"].startswith("timeout")
+    assert round(mutation_score(results), 1) == 85.7
+
+
+def test_cache_skips_unchanged_mutants(tmp_path):
+    cache = tmp_path / "cache.json"
+    specs = [s for s in discover_mutants() if s["original"] == "bubble_sort"]
+    first = run_mutants(specs, jobs=2, cache_path=str(cache))
+    assert not any(r["cached"] for r in first)
+
+    second = run_mutants(specs, jobs=2, cache_path=str(cache))
+    assert all(r["cached"] for r in second)
+    assert [r["status"] for r in second] == [r["status"] for r in first]
+
+    specs[0] = dict(specs[0], hash="changed")
+    third = run_mutants(specs, jobs=2, cache_path=str(cache))
+    assert [r["cached"] for r in third] == [False, True, True, True]
+
+
+def test_unmutated_catalog_copy_survives(tmp_path, monkeypatch):
+    source = inspect.getsource(catalog_mutants.process_catalog_m01)
+    assert "len(items) + 1" in source
+    module = tmp_path / "unmutated_catalog_copy.py"
+    module.write_text(
+        "from algorithms.catalog import _apply_search, _apply_sort, SORT_ALGORITHMS, SEARCH_ALGORITHMS, VALID_SORT_FIELDS\n\n"
+        + source.replace("len(items) + 1", "len(items)"),
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    status, detail = kill_check("unmutated_catalog_copy", "process_catalog_m01", "process_catalog")
+    assert status == "survived", detail
+    assert kill_check("algorithms.mutants.catalog_mutants", "process_catalog_m01", "process_catalog")[0] == "killed"
@@ -2,7 +2,12 @@
 
 
 def get_item_value(item, key):
-    """Extract a comparable value from a dict or model instance."""
+    """Extract a comparable value from a dict or model instance.
+
+    ``key`` may also be a callable, which is applied to the item directly.
+    """
+    if callable(key):
+        return key(item)
     if isinstance(item, dict):
         return item.get(key, "")
     return getattr(item, key, "")